@@ -1,6 +1,29 @@
 """Reusable maze generation package."""
 
+from .cache import MazeCache
+from .constants import PACKAGE_VERSION as __version__
 from .generator import MazeGenerator
+from .incremental import IncrementalSolver
+from .limits import (
+    CancelToken,
+    DeadlineExceeded,
+    GenerationCancelled,
+    RunControl,
+)
+from .mask import MaskBuilder, MaskPattern, MaskWarning
 from .solver import MazeSolver
 
-__all__ = ["MazeGenerator", "MazeSolver"]
+__all__ = [
+    "CancelToken",
+    "DeadlineExceeded",
+    "GenerationCancelled",
+    "IncrementalSolver",
+    "MaskBuilder",
+    "MaskPattern",
+    "MaskWarning",
+    "MazeCache",
+    "MazeGenerator",
+    "MazeSolver",
+    "RunControl",
+    "__version__",
+]
@@ -0,0 +1,31 @@
+"""Command-line entry point: ``python -m MazeGen <command> <config>``."""
+
+import argparse
+import sys
+
+from .config import parse_config, run_headless
+
+
+def main() -> None:
+    """Validate a configuration or generate its maze without a GUI."""
+    parser = argparse.ArgumentParser(
+        prog="python -m MazeGen",
+        description="Headless maze generation.",
+    )
+    parser.add_argument("command", choices=["generate", "validate"])
+    parser.add_argument("config_file")
+    args = parser.parse_args()
+
+    try:
+        config = parse_config(args.config_file)
+    except ValueError as exc:
+        print(f"Configuration Error: {exc}")
+        sys.exit(1)
+    if args.command == "validate":
+        print(f"Configuration '{args.config_file}' is valid.")
+        return
+    sys.exit(run_headless(config))
+
+
+if __name__ == "__main__":
+    main()
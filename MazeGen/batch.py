@@ -0,0 +1,406 @@
+"""Batched generation of many small mazes of the same size.
+
+``generate_batch()`` carves K mazes at once in a (K, H, W) array with the
+vectorized Sidewinder or Binary-Tree links, applies the blocked mask once
+for the whole batch and solves every maze with one batched frontier BFS.
+Maze ``index`` draws from its own generator seeded with ``(seed,
+index)``, so it is the same whichever batch it is generated in.
+Requires NumPy.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .carver_vectorized import (
+    HAS_NUMPY,
+    _np_binary_tree_links,
+    _np_sidewinder_links,
+    _np_walls,
+)
+from .constants import DIRS, MAX_SCALE
+from .grid import OUTPUT_CHUNK, MazeGrid, iter_output_chunks
+from .mask import PATTERN_42, MaskBuilder, MaskPattern
+from .solver import DIR_LETTERS
+
+Coord = Tuple[int, int]
+LinkFunction = Callable[[Any, Any], Tuple[Any, Any, Any]]
+
+BATCH_ALGORITHMS: Dict[str, LinkFunction] = {
+    "sidewinder": _np_sidewinder_links,
+    "binary_tree": _np_binary_tree_links,
+}
+
+_LETTERS = b"?" + "".join(
+    DIR_LETTERS[(dx, dy)] for dx, dy, _b_curr, _b_next in DIRS
+).encode("ascii")
+
+
+class _StackedRandom:
+    """Draw each maze's share of a batched request from its own generator.
+
+    Implements the two ``numpy.random.Generator`` calls the link
+    functions make, stacking one draw per maze along the first axis.
+    """
+
+    def __init__(self, gens: List[Any]) -> None:
+        """Store one generator per maze of the batch."""
+        self.gens = gens
+
+    def random(self, shape: Tuple[int, ...]) -> Any:
+        """Return uniform floats of shape (K, ...)."""
+        import numpy as np
+
+        return np.stack([gen.random(shape[1:]) for gen in self.gens])
+
+    def integers(self, low: int, high: int, size: int, dtype: Any) -> Any:
+        """Return a flat array of ``size`` integers, K equal parts."""
+        import numpy as np
+
+        part = size // len(self.gens)
+        return np.concatenate([
+            gen.integers(low, high, size=part, dtype=dtype)
+            for gen in self.gens
+        ])
+
+
+@dataclass(frozen=True)
+class MazeBatch:
+    """K perfect mazes of one size with their shortest paths."""
+
+    width: int
+    height: int
+    entry: Coord
+    exit: Coord
+    seed: int
+    start: int
+    walls: Any
+    blocked: Any
+    solutions: Tuple[Optional[str], ...]
+
+    def __len__(self) -> int:
+        """Return the number of mazes."""
+        return len(self.solutions)
+
+    def index(self, k: int) -> int:
+        """Return the (seed, index) index of the k-th maze."""
+        return self.start + k
+
+    def grid(self, k: int) -> MazeGrid:
+        """Return the k-th maze as a standalone MazeGrid."""
+        grid = MazeGrid(self.width, self.height)
+        grid.load_rows(self.walls[k].tolist())
+        return grid
+
+    def _grid_view(self, k: int) -> MazeGrid:
+        """Return the k-th maze as a MazeGrid over the wall array."""
+        return MazeGrid(
+            self.width,
+            self.height,
+            buffer=memoryview(self.walls[k]),
+            clear=False,
+        )
+
+    def hex_rows(self, k: int) -> List[str]:
+        """Return the k-th maze as hexadecimal rows."""
+        return list(self._grid_view(k).iter_hex_rows())
+
+    def iter_output(
+        self,
+        k: int,
+        chunk_size: int = OUTPUT_CHUNK,
+    ) -> Iterator[bytes]:
+        """Yield the k-th maze's output file in chunks of about chunk_size.
+
+        Same format and routine as ``MazeGenerator.iter_output()``.
+        """
+        solution = self.solutions[k]
+        if solution is None:
+            raise RuntimeError("No valid solution exists for this maze.")
+
+        yield from iter_output_chunks(
+            self._grid_view(k), self.entry, self.exit, solution, chunk_size
+        )
+
+    def build_output_text(self, k: int) -> str:
+        """Return the k-th maze in the project output format."""
+        return b"".join(self.iter_output(k)).decode("ascii")
+
+
+def generate_batch(
+    width: int,
+    height: int,
+    entry: Coord,
+    exit_: Coord,
+    count: int,
+    seed: int,
+    start: int = 0,
+    algorithm: str = "sidewinder",
+    margin: int = 1,
+    mask: Optional[MaskPattern] = None,
+    mask_max_scale: Optional[int] = MAX_SCALE,
+) -> MazeBatch:
+    """Generate and solve mazes ``start`` to ``start + count - 1``."""
+    if not HAS_NUMPY:
+        raise RuntimeError("NumPy is required for batched generation.")
+    if algorithm not in BATCH_ALGORITHMS:
+        raise ValueError(
+            f"Unknown batch algorithm '{algorithm}'. "
+            f"Choose one of: {', '.join(sorted(BATCH_ALGORITHMS))}."
+        )
+    if count <= 0:
+        raise ValueError("count must be positive.")
+    if start < 0:
+        raise ValueError("start must be >= 0.")
+    if width <= 0 or height <= 0:
+        raise ValueError("Width and height must be positive.")
+    for name, (x, y) in (("ENTRY", entry), ("EXIT", exit_)):
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"{name} is out of maze bounds.")
+    if entry == exit_:
+        raise ValueError("ENTRY and EXIT must be different.")
+
+    import numpy as np
+
+    pattern = PATTERN_42 if mask is None else mask
+    layout = MaskBuilder(pattern, margin, mask_max_scale).layout(
+        width, height
+    )
+    if not layout.connected:
+        raise ValueError(
+            f"The '{pattern.name}' mask splits the free cells into "
+            "separate regions."
+        )
+    blocked = (
+        np.frombuffer(b"".join(layout.rows), dtype=np.uint8)
+        .reshape(height, width)
+        .astype(bool)
+    )
+    for name, (x, y) in (("ENTRY", entry), ("EXIT", exit_)):
+        if blocked[y, x]:
+            raise ValueError(
+                f"{name} is inside the '{pattern.name}' pattern."
+            )
+
+    gens = [
+        np.random.default_rng([seed, index])
+        for index in range(start, start + count)
+    ]
+    free = np.broadcast_to(~blocked, (count, height, width))
+    stacked = _StackedRandom(gens)
+    open_n, open_e, parent = BATCH_ALGORITHMS[algorithm](free, stacked)
+    weights = stacked.random((count, 2, height, width)).swapaxes(0, 1)
+    _repair_batch(free, open_n, open_e, parent, weights)
+    walls = _np_walls(open_n, open_e)
+
+    return MazeBatch(
+        width,
+        height,
+        entry,
+        exit_,
+        seed,
+        start,
+        walls,
+        blocked,
+        solve_batch(walls, entry, exit_),
+    )
+
+
+def _repair_batch(
+    free: Any,
+    open_n: Any,
+    open_e: Any,
+    parent: Any,
+    weights: Any,
+) -> None:
+    """Join every maze's link forest into one tree, all mazes at once.
+
+    Borůvka rounds: each component opens its lightest wall towards
+    another component, until no wall separates two components.  The
+    weights come from each maze's own generator, so the result of one
+    maze does not depend on the rest of the batch.
+    """
+    import numpy as np
+
+    comp = parent.reshape(-1)
+    while True:
+        hop = comp[comp]
+        if np.array_equal(hop, comp):
+            break
+        comp = hop
+    comp = comp.reshape(free.shape)
+
+    width = free.shape[-1]
+    idx = np.arange(free.size, dtype=np.int64).reshape(free.shape)
+    h_mask = (
+        free[..., :, :-1]
+        & free[..., :, 1:]
+        & (comp[..., :, :-1] != comp[..., :, 1:])
+    )
+    v_mask = (
+        free[..., :-1, :]
+        & free[..., 1:, :]
+        & (comp[..., :-1, :] != comp[..., 1:, :])
+    )
+    west = idx[..., :, :-1][h_mask]
+    north = idx[..., :-1, :][v_mask]
+    firsts = np.concatenate([west, north])
+    seconds = np.concatenate([west + 1, north + width])
+    vertical = np.concatenate([
+        np.zeros(west.size, dtype=bool),
+        np.ones(north.size, dtype=bool),
+    ])
+    edge_weights = np.concatenate([
+        weights[0][..., :, :-1][h_mask],
+        weights[1][..., :-1, :][v_mask],
+    ])
+    order = np.argsort(edge_weights, kind="stable")
+    firsts, seconds, vertical = firsts[order], seconds[order], vertical[order]
+
+    flat_comp = comp.reshape(-1)
+    roots, ends = np.unique(
+        np.concatenate([flat_comp[firsts], flat_comp[seconds]]),
+        return_inverse=True,
+    )
+    end_a, end_b = ends[:firsts.size], ends[firsts.size:]
+    label = np.arange(roots.size)
+    flat_n = open_n.reshape(-1)
+    flat_e = open_e.reshape(-1)
+    while firsts.size:
+        ra = label[end_a]
+        rb = label[end_b]
+        cross = ra != rb
+        if not cross.any():
+            break
+        firsts, seconds, vertical = (
+            firsts[cross], seconds[cross], vertical[cross]
+        )
+        end_a, end_b, ra, rb = end_a[cross], end_b[cross], ra[cross], rb[cross]
+
+        # Edges are sorted by weight, so the first edge seen for a
+        # component is its lightest one.
+        both = np.concatenate([ra, rb])
+        edge_ids = np.tile(np.arange(firsts.size), 2)
+        by_edge = np.argsort(edge_ids, kind="stable")
+        _, first = np.unique(both[by_edge], return_index=True)
+        chosen = np.unique(edge_ids[by_edge][first])
+
+        pick_v = chosen[vertical[chosen]]
+        pick_h = chosen[~vertical[chosen]]
+        flat_n[seconds[pick_v]] = True
+        flat_e[firsts[pick_h]] = True
+
+        # Merge the joined components onto their smallest label.
+        ca, cb = ra[chosen], rb[chosen]
+        while True:
+            low = np.minimum(label[ca], label[cb])
+            before = label.copy()
+            np.minimum.at(label, ca, low)
+            np.minimum.at(label, cb, low)
+            label = label[label]
+            if np.array_equal(before, label):
+                break
+
+
+def solve_batch(
+    walls: Any,
+    entry: Coord,
+    exit_: Coord,
+) -> Tuple[Optional[str], ...]:
+    """Return a shortest path of every maze in a (K, H, W) wall array.
+
+    One frontier BFS advances all mazes a level at a time.  The batch
+    axis is packed into 64-bit lanes, so each bitwise step on a cell
+    handles 64 mazes; every cell records the direction it was first
+    reached from, and the paths are walked back from the exit together.
+    """
+    import numpy as np
+
+    count, height, width = walls.shape
+    lanes = -(-count // 64) * 64
+
+    def pack(mask: Any) -> Any:
+        """Pack a (K, H, W) bool array into (H, W, lanes / 64) words."""
+        planes = np.zeros((height, width, lanes), dtype=bool)
+        planes[..., :count] = np.moveaxis(mask, 0, -1)
+        return np.packbits(planes, axis=-1, bitorder="little").view(
+            np.uint64
+        )
+
+    def unpack(words: Any) -> Any:
+        """Unpack (H, W, lanes / 64) words into a (K, H, W) bool array."""
+        bits = np.unpackbits(
+            words.view(np.uint8), axis=-1, bitorder="little"
+        )
+        return np.moveaxis(bits[..., :count], -1, 0).astype(bool)
+
+    open_dirs = [
+        pack((walls & (1 << b_curr)) == 0) for _, _, b_curr, _ in DIRS
+    ]
+    up, right, down, left = open_dirs
+    sx, sy = entry
+    ex, ey = exit_
+
+    frontier = np.zeros_like(up)
+    frontier[sy, sx] = ~np.uint64(0)
+    visited = frontier.copy()
+    came = [np.zeros_like(up) for _ in DIRS]
+    while True:
+        moved = [np.zeros_like(up) for _ in DIRS]
+        moved[0][:-1, :] = frontier[1:, :] & up[1:, :]
+        moved[1][:, 1:] = frontier[:, :-1] & right[:, :-1]
+        moved[2][1:, :] = frontier[:-1, :] & down[:-1, :]
+        moved[3][:, :-1] = frontier[:, 1:] & left[:, 1:]
+
+        reached = np.zeros_like(up)
+        for direction, step in enumerate(moved):
+            step &= ~(visited | reached)
+            reached |= step
+            came[direction] |= step
+        if not reached.any():
+            break
+        visited |= reached
+        frontier = reached
+        if unpack(visited[ey:ey + 1, ex:ex + 1]).all():
+            break
+
+    # code[k, y, x] = 1 + DIRS index of the move that entered the cell.
+    code = np.zeros((count, height, width), dtype=np.int8)
+    for direction, plane in enumerate(came):
+        code[unpack(plane)] = direction + 1
+    code[:, sy, sx] = 0
+    reachable = unpack(visited[ey:ey + 1, ex:ex + 1])[:, 0, 0]
+
+    cells = height * width
+    flat_code = code.reshape(count, cells)
+    rows = np.arange(count)
+    offsets = np.array(
+        [0] + [dy * width + dx for dx, dy, _b_curr, _b_next in DIRS],
+        dtype=np.int64,
+    )
+    current = np.full(count, ey * width + ex, dtype=np.int64)
+    active = reachable.copy()
+    steps: List[Any] = []
+    while active.any():
+        moves = np.where(active, flat_code[rows, current], 0)
+        steps.append(moves)
+        current = current - offsets[moves]
+        active &= moves > 0
+
+    letters = (
+        np.stack(steps, axis=1)[:, ::-1]
+        if steps
+        else np.zeros((count, 0), dtype=np.int8)
+    )
+    table = bytes.maketrans(bytes(range(5)), _LETTERS)
+    solutions: List[Optional[str]] = []
+    for k in range(count):
+        if not reachable[k]:
+            solutions.append(None)
+            continue
+        row = letters[k].astype(np.uint8).tobytes()
+        solutions.append(
+            row.replace(b"\x00", b"").translate(table).decode("ascii")
+        )
+    return tuple(solutions)
@@ -0,0 +1,174 @@
+"""Content-addressed on-disk cache of generated mazes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import ALGORITHM_VERSION, PACKAGE_VERSION
+from .storage import write_atomic
+
+ENTRY_SUFFIX = ".maze"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Only directories named like a version tag are ever removed.
+VERSION_DIR = re.compile(r"v[\w.]+-a\d+")
+
+
+@dataclass(frozen=True)
+class CachedMaze:
+    """One cache entry: compact cells, packed blocked mask and solution."""
+
+    width: int
+    height: int
+    cells: bytes
+    blocked: bytes
+    solution: Optional[str]
+
+
+class MazeCache:
+    """Store generated mazes keyed by a hash of their parameters.
+
+    Entries live under a directory named after the package and algorithm
+    versions; other directories named like a version tag (``v1.0.0-a1``)
+    are removed on start-up, so an upgrade never serves stale mazes, and
+    anything else in the directory is left alone.  Writes are atomic (temporary
+    file plus ``os.replace``) and the least recently used entries are
+    evicted once the total size exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Open the cache directory and drop entries of other versions."""
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.root = directory
+        self.max_bytes = max_bytes
+        self.version_tag = f"v{PACKAGE_VERSION}-a{ALGORITHM_VERSION}"
+        self.directory = os.path.join(directory, self.version_tag)
+        os.makedirs(self.directory, exist_ok=True)
+        self._drop_stale_versions()
+
+    def _drop_stale_versions(self) -> None:
+        """Remove cache directories written by other versions."""
+        for entry in os.scandir(self.root):
+            if (
+                entry.is_dir(follow_symlinks=False)
+                and VERSION_DIR.fullmatch(entry.name) is not None
+                and entry.name != self.version_tag
+            ):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    @staticmethod
+    def key(**params: Any) -> str:
+        """Return the hex digest identifying one generation request."""
+        params["package_version"] = PACKAGE_VERSION
+        params["algorithm_version"] = ALGORITHM_VERSION
+        blob = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the file path of one entry."""
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load(self, key: str) -> Optional[CachedMaze]:
+        """Return the cached maze for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                header: Dict[str, Any] = json.loads(file.readline())
+                payload = file.read()
+            cells_len = header["width"] * header["height"]
+            blocked_len = header["blocked_bytes"]
+            expected = cells_len + blocked_len + header["solution_len"]
+            solved = bool(header["solved"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            self._remove(path)
+            return None
+
+        if len(payload) != expected:
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        solution: Optional[str] = None
+        if solved:
+            solution = payload[cells_len + blocked_len:].decode("ascii")
+        return CachedMaze(
+            header["width"],
+            header["height"],
+            payload[:cells_len],
+            payload[cells_len:cells_len + blocked_len],
+            solution,
+        )
+
+    def store(self, key: str, maze: CachedMaze) -> None:
+        """Write one entry atomically, then enforce the size cap."""
+        solution = (maze.solution or "").encode("ascii")
+        header = {
+            "width": maze.width,
+            "height": maze.height,
+            "blocked_bytes": len(maze.blocked),
+            "solution_len": len(solution),
+            "solved": maze.solution is not None,
+        }
+
+        write_atomic(
+            self._path(key),
+            [
+                json.dumps(header).encode("utf-8") + b"\n",
+                maze.cells,
+                maze.blocked,
+                solution,
+            ],
+        )
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under the cap."""
+        entries: List[Tuple[float, int, str]] = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(ENTRY_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Delete one file, ignoring a concurrent removal."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry of the current version."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                self._remove(entry.path)
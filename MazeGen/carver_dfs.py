@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import random
-from typing import List, Tuple
+from array import array
+from typing import Iterator, List, Optional, Tuple
 
 from .constants import DIRS
 from .grid import MazeGrid
+from .limits import RunControl
+from .stepwise import Changes
+from .storage import CoordStack, FlagRows, count_flags
 
 
 class DFSMazeCarver:
@@ -21,16 +25,61 @@ class DFSMazeCarver:
         grid: MazeGrid,
         start_x: int,
         start_y: int,
-        blocked: List[List[bool]],
+        blocked: FlagRows,
+        visited: Optional[FlagRows] = None,
+        control: Optional[RunControl] = None,
     ) -> None:
-        """Carve reachable free cells starting from one cell."""
-        visited = [
-            [False for _ in range(grid.width)]
-            for _ in range(grid.height)
-        ]
-        visited[start_y][start_x] = True
+        """Carve reachable free cells starting from one cell.
 
-        stack: List[Tuple[int, int]] = [(start_x, start_y)]
+        A ``visited`` mask shared between calls lets several carves fill
+        separate regions of the same grid without overlapping.  A
+        ``control`` is checked and given progress every
+        ``control.interval`` carved cells.
+        """
+        for _changed in self.iter_carve(
+            grid, start_x, start_y, blocked, visited, control
+        ):
+            pass
+
+    def iter_carve(
+        self,
+        grid: MazeGrid,
+        start_x: int,
+        start_y: int,
+        blocked: FlagRows,
+        visited: Optional[FlagRows] = None,
+        control: Optional[RunControl] = None,
+        stack: Optional[CoordStack] = None,
+    ) -> Iterator[Changes]:
+        """Carve like ``carve()``, yielding the two cells of each passage.
+
+        A caller-owned ``stack`` (a list, or a ``MappedStack`` that keeps
+        it out of RAM) can be inspected between steps.  An empty one
+        starts from the start cell; a non-empty one, together with its
+        ``visited`` mask and RNG state, resumes an interrupted carve.
+        """
+        if visited is None:
+            if control is not None:
+                control.check()
+            visited = [[False] * grid.width for _ in range(grid.height)]
+        if stack is None:
+            stack = []
+        resumed = bool(stack)
+        if not resumed:
+            visited[start_y][start_x] = True
+            stack.append((start_x, start_y))
+
+        carved = 1
+        total = 0
+        if control is not None:
+            control.check()
+            if resumed:
+                # Every cell carved before the checkpoint is marked.
+                carved = count_flags(visited)
+            for row in blocked:
+                total += len(row) - sum(row)
+                control.check()
+            control.update("carve", carved, total)
 
         while stack:
             x, y = stack[-1]
@@ -56,3 +105,141 @@ class DFSMazeCarver:
             grid.break_wall(x, y, nx, ny, b_curr, b_next)
             visited[ny][nx] = True
             stack.append((nx, ny))
+            carved += 1
+            if control is not None and carved % control.interval == 0:
+                control.update("carve", carved, total)
+            yield ((x, y), (nx, ny))
+
+        if control is not None:
+            control.update("carve", carved, total)
+
+
+class LeanDFSCarver:
+    """Carve a maze with iterative DFS over flat buffers.
+
+    Cells are addressed by their flat index ``y * width + x``.  The stack
+    is an ``array('i')`` of indices, the visited flags are one byte per
+    cell and the open neighbours of the current cell go into a fixed
+    four-slot scratch list.  Walls are cleared directly in the grid
+    buffer when the grid has one.
+
+    The direction is picked from 2-bit chunks of a buffered 64-bit
+    ``getrandbits`` draw, resampling a chunk that is out of range, so the
+    maze is deterministic for a seed but differs from ``DFSMazeCarver``.
+    Both buffers are kept between calls, so regenerating a maze of the
+    same size allocates nothing.
+    """
+
+    def __init__(self, rng: random.Random) -> None:
+        """Store the random generator and empty work buffers."""
+        self.rng = rng
+        self._visited = bytearray()
+        self._stack = array("i")
+
+    def carve(
+        self,
+        grid: MazeGrid,
+        start_x: int,
+        start_y: int,
+        blocked: FlagRows,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Carve reachable free cells starting from one cell.
+
+        A ``control`` is checked while the buffers are filled and given
+        progress every ``control.interval`` carved cells.
+        """
+        width = grid.width
+        size = width * grid.height
+        if size >= 2 ** 31:
+            raise ValueError("Grid is too large for the lean DFS carver.")
+
+        if control is not None:
+            control.check()
+        if len(self._visited) != size:
+            self._visited = bytearray(size)
+        visited = self._visited
+        for y, row in enumerate(blocked):
+            visited[y * width:(y + 1) * width] = bytes(row)
+            if control is not None:
+                control.check()
+
+        flat = grid.buffer
+        walls = flat if flat is not None else bytearray(grid.to_bytes())
+
+        offsets = [dy * width + dx for dx, dy, _b_curr, _b_next in DIRS]
+        keep_curr = [~(1 << b_curr) & 0xFF for _dx, _dy, b_curr, _b in DIRS]
+        keep_next = [~(1 << b_next) & 0xFF for _dx, _dy, _b, b_next in DIRS]
+        last_x = width - 1
+        south_limit = size - width
+        neighbors = [0, 0, 0, 0]
+        getrandbits = self.rng.getrandbits
+        bits = 0
+        avail = 0
+
+        stack = self._stack
+        # A carve stopped by its control leaves entries behind.
+        del stack[:]
+        start = start_y * width + start_x
+        visited[start] = 1
+        stack.append(start)
+
+        carved = 1
+        total = 0
+        if control is not None:
+            # Blocked and start cells are already marked in ``visited``.
+            total = size - visited.count(1) + 1
+            control.update("carve", carved, total)
+
+        while stack:
+            i = stack[-1]
+            x = i % width
+            count = 0
+            if i >= width and not visited[i - width]:
+                neighbors[count] = 0
+                count += 1
+            if x < last_x and not visited[i + 1]:
+                neighbors[count] = 1
+                count += 1
+            if i < south_limit and not visited[i + width]:
+                neighbors[count] = 2
+                count += 1
+            if x and not visited[i - 1]:
+                neighbors[count] = 3
+                count += 1
+
+            if not count:
+                stack.pop()
+                continue
+
+            if count == 1:
+                d = neighbors[0]
+            else:
+                while True:
+                    if avail < 2:
+                        bits = getrandbits(64)
+                        avail = 64
+                    pick = bits & 3
+                    bits >>= 2
+                    avail -= 2
+                    if count == 2:
+                        pick &= 1
+                    if pick < count:
+                        break
+                d = neighbors[pick]
+
+            j = i + offsets[d]
+            walls[i] &= keep_curr[d]
+            walls[j] &= keep_next[d]
+            visited[j] = 1
+            stack.append(j)
+            if control is not None:
+                carved += 1
+                if carved % control.interval == 0:
+                    control.update("carve", carved, total)
+
+        if control is not None:
+            control.update("carve", carved, total)
+        if flat is None:
+            for y in range(grid.height):
+                grid.write_row(y, 0, bytes(walls[y * width:(y + 1) * width]))
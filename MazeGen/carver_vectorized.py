@@ -0,0 +1,401 @@
+"""Vectorized Sidewinder and Binary-Tree maze carving.
+
+Both algorithms decide every passage independently of the carving order,
+so the whole wall array can be produced in a few NumPy passes.  When NumPy
+is not installed, an equivalent row-wise pure-Python version is used.
+NumPy is imported on first use so that importing the package stays fast.
+"""
+
+from __future__ import annotations
+
+import random
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import ALL_WALLS
+from .grid import MazeGrid
+from .limits import RunControl
+from .storage import FlagRows, PackedBitmap
+
+HAS_NUMPY = find_spec("numpy") is not None
+
+
+def _np_binary_tree_links(
+    free: Any,
+    gen: Any,
+) -> Tuple[Any, Any, Any]:
+    """Return (open_n, open_e, parent) for Binary-Tree on (..., H, W)."""
+    import numpy as np
+
+    width = free.shape[-1]
+    idx = np.arange(free.size, dtype=np.int64).reshape(free.shape)
+
+    can_n = np.zeros_like(free)
+    can_n[..., 1:, :] = free[..., 1:, :] & free[..., :-1, :]
+    can_e = np.zeros_like(free)
+    can_e[..., :, :-1] = free[..., :, :-1] & free[..., :, 1:]
+
+    coin = gen.random(free.shape) < 0.5
+    open_n = can_n & (~can_e | coin)
+    open_e = can_e & ~open_n
+
+    parent = np.where(open_n, idx - width, np.where(open_e, idx + 1, idx))
+    return open_n, open_e, parent
+
+
+def _np_sidewinder_links(
+    free: Any,
+    gen: Any,
+) -> Tuple[Any, Any, Any]:
+    """Return (open_n, open_e, parent) for Sidewinder on (..., H, W)."""
+    import numpy as np
+
+    width = free.shape[-1]
+    size = free.size
+    idx = np.arange(size, dtype=np.int64).reshape(free.shape)
+
+    can_n = np.zeros_like(free)
+    can_n[..., 1:, :] = free[..., 1:, :] & free[..., :-1, :]
+    can_e = np.zeros_like(free)
+    can_e[..., :, :-1] = free[..., :, :-1] & free[..., :, 1:]
+
+    top_row = np.zeros_like(free)
+    top_row[..., 0, :] = True
+    open_e = can_e & (top_row | (gen.random(free.shape) < 0.5))
+
+    # A run starts on every cell the west neighbour did not carve into.
+    run_start = np.ones_like(free)
+    run_start[..., :, 1:] = ~open_e[..., :, :-1]
+    flat_start = run_start.reshape(-1)
+    starts = np.flatnonzero(flat_start)
+    run_id = np.cumsum(flat_start) - 1
+
+    # Each run carves north from one random eligible member.
+    priority = gen.integers(0, 1 << 20, size=size, dtype=np.int64)
+    key = np.where(can_n.reshape(-1), priority * size + idx.reshape(-1), -1)
+    best = np.maximum.reduceat(key, starts)
+    has_north = best >= 0
+    chosen = best[has_north] % size
+
+    open_n = np.zeros(size, dtype=bool)
+    open_n[chosen] = True
+    open_n = open_n.reshape(free.shape)
+
+    run_target = starts.copy()
+    run_target[has_north] = chosen - width
+    parent = run_target[run_id].reshape(free.shape)
+    return open_n, open_e, parent
+
+
+def _np_repair(
+    free: Any,
+    open_n: Any,
+    open_e: Any,
+    parent: Any,
+    gen: Any,
+    control: Optional[RunControl] = None,
+) -> None:
+    """Join the link forest into one tree per connected free region."""
+    import numpy as np
+
+    root = parent.reshape(-1)
+    while True:
+        hop = root[root]
+        if np.array_equal(hop, root):
+            break
+        root = hop
+    root = root.reshape(free.shape)
+
+    if np.unique(root[free]).size <= 1:
+        return
+
+    h_mask = (
+        free[..., :, :-1]
+        & free[..., :, 1:]
+        & (root[..., :, :-1] != root[..., :, 1:])
+    )
+    v_mask = (
+        free[..., :-1, :]
+        & free[..., 1:, :]
+        & (root[..., :-1, :] != root[..., 1:, :])
+    )
+    idx = np.arange(free.size, dtype=np.int64).reshape(free.shape)
+    west = idx[..., :, :-1][h_mask]
+    north = idx[..., :-1, :][v_mask]
+    width = free.shape[-1]
+
+    firsts = np.concatenate([west, north])
+    seconds = np.concatenate([west + 1, north + width])
+    vertical = np.concatenate([
+        np.zeros(west.size, dtype=bool),
+        np.ones(north.size, dtype=bool),
+    ])
+
+    flat_root = root.reshape(-1)
+    flat_n = open_n.reshape(-1)
+    flat_e = open_e.reshape(-1)
+    union: Dict[int, int] = {}
+
+    def find(label: int) -> int:
+        """Return the representative of one component label."""
+        path: List[int] = []
+        while union.get(label, label) != label:
+            path.append(label)
+            label = union[label]
+        for item in path:
+            union[item] = label
+        return label
+
+    for step, pos in enumerate(gen.permutation(firsts.size).tolist()):
+        if control is not None and step % control.interval == 0:
+            control.check()
+        a = int(firsts[pos])
+        b = int(seconds[pos])
+        ra = find(int(flat_root[a]))
+        rb = find(int(flat_root[b]))
+        if ra == rb:
+            continue
+        union[ra] = rb
+        if vertical[pos]:
+            flat_n[b] = True
+        else:
+            flat_e[a] = True
+
+
+def _np_walls(open_n: Any, open_e: Any, out: Any = None) -> Any:
+    """Convert passage flags on (..., H, W) into wall bit values.
+
+    The values are written into ``out`` (a uint8 array of the same shape)
+    when given, for instance a view of a grid's cell buffer.
+    """
+    import numpy as np
+
+    open_s = np.zeros_like(open_n)
+    open_s[..., :-1, :] = open_n[..., 1:, :]
+    open_w = np.zeros_like(open_e)
+    open_w[..., :, 1:] = open_e[..., :, :-1]
+
+    walls = np.empty(open_n.shape, dtype=np.uint8) if out is None else out
+    walls[...] = ALL_WALLS
+    walls -= open_n.astype(np.uint8)
+    walls -= open_e.astype(np.uint8) << 1
+    walls -= open_s.astype(np.uint8) << 2
+    walls -= open_w.astype(np.uint8) << 3
+    return walls
+
+
+class _FieldCarver(ABC):
+    """Shared driver for order-independent carving algorithms.
+
+    Subclasses supply the passages through ``_np_links`` (NumPy) and
+    ``_py_links`` (pure Python).
+    """
+
+    name = ""
+
+    def __init__(self, rng: random.Random) -> None:
+        """Store the random generator."""
+        self.rng = rng
+
+    @property
+    def backend(self) -> str:
+        """Return the implementation in use: "numpy" or "python"."""
+        return "numpy" if HAS_NUMPY else "python"
+
+    def build_walls(
+        self,
+        blocked: FlagRows,
+        out: Any = None,
+        control: Optional[RunControl] = None,
+    ) -> Any:
+        """Return the wall values as a (height, width) uint8 array.
+
+        With ``out``, the values are written into that array instead.  A
+        ``control`` is checked between the NumPy passes.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy is required for build_walls().")
+
+        import numpy as np
+
+        if isinstance(blocked, PackedBitmap):
+            packed = np.frombuffer(blocked.buffer, dtype=np.uint8)
+            bits = np.unpackbits(
+                packed.reshape(blocked.height, blocked.row_bytes),
+                axis=1,
+                bitorder="little",
+            )
+            free = bits[:, :blocked.width] == 0
+        else:
+            free = ~np.asarray(blocked, dtype=bool)
+        gen = np.random.default_rng(self.rng.getrandbits(64))
+        if control is not None:
+            control.check()
+        open_n, open_e, parent = self._np_links(free, gen)
+        if control is not None:
+            control.check()
+        _np_repair(free, open_n, open_e, parent, gen, control)
+        if control is not None:
+            control.check()
+        return _np_walls(open_n, open_e, out)
+
+    def carve(
+        self,
+        grid: MazeGrid,
+        start_x: int,
+        start_y: int,
+        blocked: FlagRows,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Carve every free cell; the start cell does not matter here.
+
+        A grid with a flat buffer (mapped or shared) is written in place
+        through a NumPy view; list grids are loaded row by row.  A
+        ``control`` is checked between passes and rows.
+        """
+        if control is not None:
+            control.check()
+        if HAS_NUMPY:
+            import numpy as np
+
+            flat = grid.buffer
+            if flat is not None:
+                view = np.frombuffer(flat, dtype=np.uint8)
+                self.build_walls(
+                    blocked, view.reshape(grid.height, grid.width), control
+                )
+                return
+            walls = self.build_walls(blocked, control=control)
+            grid.load_rows(walls.tolist())
+            return
+
+        grid.reset()
+        width = grid.width
+        uf = list(range(width * grid.height))
+
+        def find(cell: int) -> int:
+            """Return the union-find root of one flat cell index."""
+            while uf[cell] != cell:
+                uf[cell] = uf[uf[cell]]
+                cell = uf[cell]
+            return cell
+
+        def link(x: int, y: int, nx: int, ny: int) -> None:
+            """Open the wall between two adjacent cells and merge them."""
+            if nx == x:
+                top = min(y, ny)
+                grid.break_wall(x, top, x, top + 1, 2, 0)
+            else:
+                left = min(x, nx)
+                grid.break_wall(left, y, left + 1, y, 1, 3)
+            uf[find(y * width + x)] = find(ny * width + nx)
+
+        self._py_links(grid, blocked, link, control)
+
+        candidates: List[Tuple[int, int, int, int]] = []
+        for y in range(grid.height):
+            if control is not None:
+                control.check()
+            for x in range(width):
+                if blocked[y][x]:
+                    continue
+                if x + 1 < width and not blocked[y][x + 1]:
+                    candidates.append((x, y, x + 1, y))
+                if y + 1 < grid.height and not blocked[y + 1][x]:
+                    candidates.append((x, y, x, y + 1))
+
+        self.rng.shuffle(candidates)
+        for step, (x, y, nx, ny) in enumerate(candidates):
+            if control is not None and step % control.interval == 0:
+                control.check()
+            if find(y * width + x) != find(ny * width + nx):
+                link(x, y, nx, ny)
+
+    @abstractmethod
+    def _np_links(self, free: Any, gen: Any) -> Tuple[Any, Any, Any]:
+        """Return vectorized passage flags and the link forest."""
+
+    @abstractmethod
+    def _py_links(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        link: Any,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Open the algorithm's passages with plain Python loops.
+
+        Implementations check ``control`` once per row.
+        """
+
+
+class BinaryTreeCarver(_FieldCarver):
+    """Carve a maze where every cell opens north or east."""
+
+    name = "binary_tree"
+
+    def _np_links(self, free: Any, gen: Any) -> Tuple[Any, Any, Any]:
+        """Return vectorized Binary-Tree passages."""
+        return _np_binary_tree_links(free, gen)
+
+    def _py_links(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        link: Any,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Open Binary-Tree passages cell by cell."""
+        for y in range(grid.height):
+            if control is not None:
+                control.check()
+            for x in range(grid.width):
+                if blocked[y][x]:
+                    continue
+                options: List[Tuple[int, int]] = []
+                if y > 0 and not blocked[y - 1][x]:
+                    options.append((x, y - 1))
+                if x + 1 < grid.width and not blocked[y][x + 1]:
+                    options.append((x + 1, y))
+                if options:
+                    nx, ny = self.rng.choice(options)
+                    link(x, y, nx, ny)
+
+
+class SidewinderCarver(_FieldCarver):
+    """Carve a maze row by row with east runs closed northwards."""
+
+    name = "sidewinder"
+
+    def _np_links(self, free: Any, gen: Any) -> Tuple[Any, Any, Any]:
+        """Return vectorized Sidewinder passages."""
+        return _np_sidewinder_links(free, gen)
+
+    def _py_links(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        link: Any,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Open Sidewinder passages one row at a time."""
+        for y in range(grid.height):
+            if control is not None:
+                control.check()
+            run: List[int] = []
+            for x in range(grid.width):
+                if blocked[y][x]:
+                    continue
+                run.append(x)
+
+                can_east = x + 1 < grid.width and not blocked[y][x + 1]
+                if can_east and (y == 0 or self.rng.random() < 0.5):
+                    link(x, y, x + 1, y)
+                    continue
+
+                north = [cx for cx in run if y > 0 and not blocked[y - 1][cx]]
+                if north:
+                    cx = self.rng.choice(north)
+                    link(cx, y, cx, y - 1)
+                run = []
@@ -0,0 +1,136 @@
+"""Checkpoint files for resuming an interrupted DFS carve."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .storage import BytesLike, write_atomic
+
+CHECKPOINT_FORMAT = 1
+
+Coord = Tuple[int, int]
+RngState = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Carver state at one step: cells, visited mask, stack and RNG.
+
+    ``stack`` holds the DFS stack as flat cell indices (``y * width +
+    x``), 64-bit in native byte order.  The buffers may be views: of the
+    live mapped storage when writing, of a read-only map of the file once
+    loaded, so neither direction copies a mapped maze into RAM.
+    """
+
+    fingerprint: str
+    width: int
+    height: int
+    cells: BytesLike
+    visited: BytesLike
+    stack: BytesLike
+    rng_state: RngState
+
+
+def fingerprint(**params: Any) -> str:
+    """Return the digest tying a checkpoint to one generation request."""
+    blob = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def pack_stack(stack: Iterable[Coord], width: int) -> bytes:
+    """Return (x, y) cells as native 64-bit flat indices."""
+    return array("q", (y * width + x for x, y in stack)).tobytes()
+
+
+def unpack_stack(data: BytesLike, width: int) -> List[Coord]:
+    """Return native 64-bit flat indices as (x, y) cells."""
+    return [
+        (index % width, index // width)
+        for index in memoryview(data).cast("B").cast("q")
+    ]
+
+
+def write_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint atomically, streaming each buffer as it is.
+
+    Layout: one JSON header line, then the cell bytes, the packed visited
+    bitmap and the stack as flat cell indices (64-bit, native order).
+    """
+    width = checkpoint.width
+    stack_bytes = len(memoryview(checkpoint.stack).cast("B"))
+    if stack_bytes % 8:
+        raise ValueError("Stack data must hold whole 64-bit indices.")
+    version, internal, gauss_next = checkpoint.rng_state
+    header = {
+        "format": CHECKPOINT_FORMAT,
+        "fingerprint": checkpoint.fingerprint,
+        "width": width,
+        "height": checkpoint.height,
+        "visited_bytes": len(memoryview(checkpoint.visited).cast("B")),
+        "stack_len": stack_bytes // 8,
+        "byteorder": sys.byteorder,
+        "rng": [version, list(internal), gauss_next],
+    }
+    write_atomic(
+        path,
+        [
+            json.dumps(header).encode("utf-8") + b"\n",
+            checkpoint.cells,
+            checkpoint.visited,
+            checkpoint.stack,
+        ],
+    )
+
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """Return the checkpoint stored at path, or None if there is none.
+
+    The file is mapped read-only and the returned buffers are views of
+    that map, which stays open until they are dropped.
+    """
+    try:
+        with open(path, "rb") as file:
+            first_line = file.readline()
+            header: Dict[str, Any] = json.loads(first_line)
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Unreadable checkpoint '{path}': {exc}") from exc
+    payload = memoryview(data)[len(first_line):]
+
+    try:
+        if header["format"] != CHECKPOINT_FORMAT:
+            raise ValueError("unsupported format")
+        width = int(header["width"])
+        height = int(header["height"])
+        cells_len = width * height
+        visited_len = int(header["visited_bytes"])
+        stack_bytes = int(header["stack_len"]) * 8
+        if len(payload) != cells_len + visited_len + stack_bytes:
+            raise ValueError("truncated payload")
+        stack: BytesLike = payload[cells_len + visited_len:]
+        if header["byteorder"] != sys.byteorder:
+            swapped = array("q")
+            swapped.frombytes(stack)
+            swapped.byteswap()
+            stack = swapped.tobytes()
+        version, internal, gauss_next = header["rng"]
+        rng_state: RngState = (version, tuple(internal), gauss_next)
+        return Checkpoint(
+            str(header["fingerprint"]),
+            width,
+            height,
+            payload[:cells_len],
+            payload[cells_len:cells_len + visited_len],
+            stack,
+            rng_state,
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Corrupt checkpoint '{path}': {exc}") from exc
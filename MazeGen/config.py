@@ -0,0 +1,192 @@
+"""Configuration file parsing and headless generation."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from .cache import MazeCache
+from .constants import MAX_SCALE
+from .generator import MazeGenerator
+from .limits import RunControl
+from .mask import MaskPattern
+
+
+MANDATORY_KEYS = [
+    "WIDTH",
+    "HEIGHT",
+    "ENTRY",
+    "EXIT",
+    "OUTPUT_FILE",
+    "PERFECT",
+]
+OPTIONAL_KEYS = [
+    "SEED",
+    "CACHE_DIR",
+    "TIMEOUT",
+    "MEMORY_BUDGET_MB",
+    "CHECKPOINT_FILE",
+    "CHECKPOINT_EVERY",
+    "MASK_FILE",
+    "MASK_MAX_SCALE",
+    "BRAID",
+]
+ALLOWED_KEYS = set(MANDATORY_KEYS + OPTIONAL_KEYS)
+
+
+def parse_config(filename: str) -> Dict[str, Any]:
+    """Parse and validate the configuration file.
+
+    Raises ValueError, naming the problem, for a missing, unreadable or
+    invalid file.
+    """
+    config: Dict[str, Any] = {}
+
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            for raw_line in file:
+                line = raw_line.strip()
+
+                if not line or line.startswith("#"):
+                    continue
+
+                if "=" not in line:
+                    raise ValueError(f"Invalid format (missing '='): '{line}'")
+
+                key, value = line.split("=", 1)
+                key = key.strip().upper()
+                value = value.strip()
+
+                if key not in ALLOWED_KEYS:
+                    raise ValueError(f"Unknown configuration key: '{key}'")
+                if key in config:
+                    raise ValueError(f"Duplicate configuration key: '{key}'")
+
+                if key in ["WIDTH", "HEIGHT"]:
+                    try:
+                        config[key] = int(value)
+                    except ValueError as exc:
+                        raise ValueError(f"{key} must be an integer.") from exc
+                elif key in ["ENTRY", "EXIT"]:
+                    coords = value.split(",")
+                    if len(coords) != 2:
+                        raise ValueError(f"{key} must use the format x,y.")
+                    try:
+                        config[key] = (
+                            int(coords[0].strip()),
+                            int(coords[1].strip()),
+                        )
+                    except ValueError as exc:
+                        raise ValueError(
+                            f"Coordinates for {key} must be integers."
+                        ) from exc
+                elif key == "PERFECT":
+                    lowered = value.lower()
+                    if lowered not in ["true", "false"]:
+                        raise ValueError("PERFECT must be 'True' or 'False'.")
+                    config[key] = lowered == "true"
+                elif key == "SEED":
+                    try:
+                        config[key] = int(value)
+                    except ValueError as exc:
+                        raise ValueError("SEED must be an integer.") from exc
+                elif key == "TIMEOUT":
+                    try:
+                        config[key] = float(value)
+                    except ValueError as exc:
+                        raise ValueError("TIMEOUT must be a number.") from exc
+                    if not config[key] > 0:
+                        raise ValueError("TIMEOUT must be positive.")
+                elif key == "BRAID":
+                    try:
+                        config[key] = float(value)
+                    except ValueError as exc:
+                        raise ValueError("BRAID must be a number.") from exc
+                    if not 0.0 <= config[key] <= 1.0:
+                        raise ValueError("BRAID must be between 0 and 1.")
+                elif key in [
+                    "MEMORY_BUDGET_MB",
+                    "CHECKPOINT_EVERY",
+                    "MASK_MAX_SCALE",
+                ]:
+                    try:
+                        config[key] = int(value)
+                    except ValueError as exc:
+                        raise ValueError(f"{key} must be an integer.") from exc
+                    if config[key] <= 0:
+                        raise ValueError(f"{key} must be positive.")
+                else:
+                    if not value:
+                        raise ValueError(f"{key} cannot be empty.")
+                    config[key] = value
+
+        for mandatory_key in MANDATORY_KEYS:
+            if mandatory_key not in config:
+                raise ValueError(
+                    f"Missing mandatory configuration: '{mandatory_key}'"
+                )
+
+    except FileNotFoundError as exc:
+        raise ValueError(
+            f"The configuration file '{filename}' was not found."
+        ) from exc
+    except OSError as exc:
+        raise ValueError(
+            f"Could not read the configuration file '{filename}': {exc}"
+        ) from exc
+
+    return config
+
+
+def build_generator(config: Dict[str, Any]) -> MazeGenerator:
+    """Create a MazeGenerator from a parsed configuration."""
+    return MazeGenerator(
+        config["WIDTH"],
+        config["HEIGHT"],
+        config["ENTRY"],
+        config["EXIT"],
+        config["OUTPUT_FILE"],
+        config["PERFECT"],
+        seed=config.get("SEED"),
+        cache=(
+            MazeCache(config["CACHE_DIR"]) if "CACHE_DIR" in config else None
+        ),
+        memory_budget=(
+            config["MEMORY_BUDGET_MB"] * 1024 * 1024
+            if "MEMORY_BUDGET_MB" in config
+            else None
+        ),
+        checkpoint_path=config.get("CHECKPOINT_FILE"),
+        checkpoint_every=config.get("CHECKPOINT_EVERY", 1_000_000),
+        mask=(
+            MaskPattern.load(config["MASK_FILE"])
+            if "MASK_FILE" in config
+            else None
+        ),
+        mask_max_scale=config.get("MASK_MAX_SCALE", MAX_SCALE),
+        braid=config.get("BRAID"),
+    )
+
+
+def run_headless(config: Dict[str, Any]) -> int:
+    """Generate the maze and write the output file without any GUI."""
+    try:
+        generator = build_generator(config)
+        control = RunControl(timeout=config.get("TIMEOUT"))
+        generator.generate(control=control)
+        for warning in generator.mask_warnings:
+            print(warning)
+        if generator.solve(control) is None:
+            raise RuntimeError("No valid solution exists for this maze.")
+    except Exception as exc:
+        print(f"Maze Generation error: {exc}")
+        return 1
+
+    try:
+        with open(generator.output_file, "wb") as file:
+            generator.write_output(file)
+    except OSError as exc:
+        print(f"Error: Could not save output file: {exc}")
+        return 1
+
+    print(f"Maze written to '{generator.output_file}'.")
+    return 0
@@ -2,6 +2,10 @@
 
 from typing import Final
 
+PACKAGE_VERSION: Final[str] = "1.0.0"
+# Bump whenever a carver change alters the maze produced for a seed.
+ALGORITHM_VERSION: Final[int] = 1
+
 ALL_WALLS: Final[int] = 15
 MAX_SCALE: Final[int] = 2
 
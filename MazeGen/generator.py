@@ -2,21 +2,83 @@
 
 from __future__ import annotations
 
+import mmap
+import os
 import random
+import shutil
+import tempfile
 from collections import deque
-from typing import List, Optional, Tuple
-
-from .carver_dfs import DFSMazeCarver
-from .constants import DIRS
-from .grid import MazeGrid
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
+
+from .cache import CachedMaze, MazeCache
+from .checkpoint import (
+    Checkpoint,
+    fingerprint,
+    load_checkpoint,
+    pack_stack,
+    unpack_stack,
+    write_checkpoint,
+)
+from .carver_dfs import DFSMazeCarver, LeanDFSCarver
+from .carver_vectorized import BinaryTreeCarver, SidewinderCarver
+from .constants import DIRS, MAX_SCALE
+from .grid import OUTPUT_CHUNK, MazeGrid, iter_output_chunks
 from .imperfect import LoopAdder
-from .mask_42 import Mask42Builder
-from .solver import MazeSolver
+from .limits import RunControl, check_memory
+from .mask import PATTERN_42, MaskBuilder, MaskPattern, MaskWarning
+from .solver import MazeSolver, Scratch
+from .stepwise import Changes, StepRunner
+from .storage import (
+    BACKENDS,
+    BytesLike,
+    FlagRows,
+    MappedStack,
+    PackedBitmap,
+    clear_flags,
+    map_file,
+    new_flags,
+    pack_flags,
+    unpack_flags,
+)
+from .tiled import TiledCarver
 
 
 Coord = Tuple[int, int]
 
 
+class MazeCarver(Protocol):
+    """Interface shared by every carving algorithm."""
+
+    def carve(
+        self,
+        grid: MazeGrid,
+        start_x: int,
+        start_y: int,
+        blocked: FlagRows,
+        *,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Carve passages into the grid, checking ``control`` as it goes."""
+
+
+CARVERS: Dict[str, Callable[[random.Random], MazeCarver]] = {
+    "dfs": DFSMazeCarver,
+    "dfs_lean": LeanDFSCarver,
+    "sidewinder": SidewinderCarver,
+    "binary_tree": BinaryTreeCarver,
+}
+
+
 class MazeGenerator:
     """Generate a maze and expose its structure and solution."""
 
@@ -29,9 +91,92 @@ class MazeGenerator:
         output_file: str,
         perfect: bool,
         seed: Optional[int] = None,
+        algorithm: str = "dfs",
+        tile_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        backend: str = "memory",
+        storage_dir: Optional[str] = None,
+        cache: Optional[MazeCache] = None,
+        memory_budget: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 1_000_000,
+        mask: Optional[MaskPattern] = None,
+        mask_max_scale: Optional[int] = MAX_SCALE,
+        braid: Optional[float] = None,
+        storage: Optional[Tuple[MazeGrid, PackedBitmap]] = None,
     ) -> None:
-        """Validate and store maze settings."""
+        """Validate and store maze settings.
+
+        Setting ``tile_size`` switches to tiled generation: the grid is
+        carved in independent tiles by up to ``workers`` processes.
+
+        ``backend="mmap"`` keeps the cells, the blocked mask and every
+        per-cell scratch buffer (including the DFS stack) in memory-mapped
+        files inside ``storage_dir`` (a temporary directory by default).
+        With ``dfs`` the carve then keeps only O(1) state per step in RAM;
+        the vectorized carvers still build whole-maze NumPy arrays.
+
+        With a ``cache`` and a fixed ``seed``, ``generate()`` reuses a
+        previously stored maze and solution for the same parameters.
+
+        ``memory_budget`` (bytes) rejects sizes whose estimated peak
+        memory is over budget before anything is allocated.
+
+        With ``checkpoint_path``, DFS carving atomically saves its cells,
+        visited mask, stack and RNG state every ``checkpoint_every``
+        carved cells.  A later ``generate()`` with the same settings
+        resumes from that file and builds the same maze an uninterrupted
+        run would; the file is removed once generation completes.
+
+        ``mask`` replaces the built-in '42' pattern with any bitmap; it is
+        centred and scaled by up to ``mask_max_scale`` (unbounded when
+        None).  Layout warnings are kept in ``mask_warnings`` and a mask
+        that would split the free cells is rejected before carving.
+
+        With ``perfect=False``, ``braid`` (0 to 1) removes that fraction of
+        the dead ends instead of opening walls at random positions.
+
+        ``storage`` is a caller-owned (grid, blocked mask) pair, e.g. over
+        shared memory, to generate into; no cell or mask buffers are
+        allocated for the generator then and the visited mask is packed.
+
+        One instance can generate many mazes: ``reseed()`` then
+        ``generate()`` carves into the same grid, mask and scratch buffers.
+        """
         self._validate(width, height, entry, exit_, output_file, perfect)
+        if algorithm not in CARVERS:
+            raise ValueError(
+                f"Unknown algorithm '{algorithm}'. "
+                f"Choose one of: {', '.join(sorted(CARVERS))}."
+            )
+        if tile_size is not None and algorithm != "dfs":
+            raise ValueError("Tiled generation only supports 'dfs'.")
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}'. "
+                f"Choose one of: {', '.join(BACKENDS)}."
+            )
+        if checkpoint_path is not None and (
+            algorithm != "dfs" or tile_size is not None
+        ):
+            raise ValueError("Checkpointing only supports untiled 'dfs'.")
+        if checkpoint_every <= 0:
+            raise ValueError("checkpoint_every must be positive.")
+        if mask_max_scale is not None and mask_max_scale < 1:
+            raise ValueError("mask_max_scale must be >= 1.")
+        if braid is not None:
+            if perfect:
+                raise ValueError("Braiding requires PERFECT=False.")
+            if not 0.0 <= braid <= 1.0:
+                raise ValueError("braid must be between 0 and 1.")
+        if memory_budget is not None:
+            check_memory(width, height, memory_budget, algorithm, backend)
+        if storage is not None:
+            if backend != "memory":
+                raise ValueError("Caller storage needs backend='memory'.")
+            for part in storage:
+                if (part.width, part.height) != (width, height):
+                    raise ValueError("Storage size does not match the maze.")
 
         self.width = width
         self.height = height
@@ -40,15 +185,56 @@ class MazeGenerator:
         self.output_file = output_file
         self.perfect = perfect
         self.seed = seed
+        self.algorithm = algorithm
+        self.tile_size = tile_size
+        self.workers = workers
+        self.backend = backend
+        self.cache = cache
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.mask = PATTERN_42 if mask is None else mask
+        self.mask_max_scale = mask_max_scale
+        self.mask_warnings: Tuple[MaskWarning, ...] = ()
+        self.braid = braid
+        self._solution: Optional[str] = None
+        self._solution_known = False
+
+        self._storage_dir: Optional[str] = None
+        self._owns_storage = False
+        if backend == "mmap":
+            if storage_dir is None:
+                storage_dir = tempfile.mkdtemp(prefix="mazegen-")
+                self._owns_storage = True
+            else:
+                os.makedirs(storage_dir, exist_ok=True)
+            self._storage_dir = storage_dir
 
         self.rng = random.Random(seed)
-        self.grid = MazeGrid(width, height)
-        self.blocked: List[List[bool]] = [
-            [False for _ in range(width)]
-            for _ in range(height)
-        ]
-
-        self._carver = DFSMazeCarver(self.rng)
+        self.grid: MazeGrid
+        self.blocked: FlagRows
+        self._visited: FlagRows
+        if storage is not None:
+            self.grid, self.blocked = storage
+            self._visited = PackedBitmap(width, height)
+        else:
+            self.grid = (
+                MazeGrid.mapped(
+                    width, height, self._storage_file("cells.bin")
+                )
+                if backend == "mmap"
+                else MazeGrid(width, height)
+            )
+            self.blocked = self._new_flags("blocked.bin")
+            self._visited = self._new_flags("visited.bin")
+        self._scratch: Optional[Scratch] = None
+        self._stack: Optional[MappedStack] = None
+        self._mask_key: Optional[Tuple[int, int, int]] = None
+
+        self._carver: MazeCarver
+        if tile_size is not None:
+            self._carver = TiledCarver(self.rng, tile_size, workers)
+        else:
+            self._carver = CARVERS[algorithm](self.rng)
         self._loop_adder = LoopAdder(self.rng)
 
     @staticmethod
@@ -96,23 +282,58 @@ class MazeGenerator:
         if not isinstance(perfect, bool):
             raise ValueError("PERFECT must be a boolean.")
 
-    def _check_connectivity(self) -> bool:
+    def _storage_file(self, name: str) -> str:
+        """Return the path of one mapped file of the mmap backend."""
+        if self._storage_dir is None:
+            raise RuntimeError("The memory backend has no storage files.")
+        return os.path.join(self._storage_dir, name)
+
+    def _new_flags(self, name: str) -> FlagRows:
+        """Return a cleared per-cell mask on the selected backend."""
+        return new_flags(self.width, self.height, self._storage_dir, name)
+
+    def close(self) -> None:
+        """Release mapped storage and remove a temporary storage dir."""
+        self.grid.release()
+        for flags in (self.blocked, self._visited):
+            if isinstance(flags, PackedBitmap):
+                flags.release()
+        if isinstance(self._scratch, mmap.mmap):
+            self._scratch.close()
+        self._scratch = None
+        if self._stack is not None:
+            self._stack.release()
+            self._stack = None
+        if self._owns_storage and self._storage_dir is not None:
+            shutil.rmtree(self._storage_dir, ignore_errors=True)
+            self._owns_storage = False
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Restart the random stream for the next ``generate()`` call.
+
+        A fixed seed reproduces the maze a fresh generator would build;
+        ``None`` draws a new random seed.
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+
+    def _check_connectivity(
+        self,
+        control: Optional[RunControl] = None,
+    ) -> bool:
         """Return True if all free cells are reachable from the entry."""
-        free_cells = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if not self.blocked[y][x]
-        ]
+        free_cells = 0
+        for row in self.blocked:
+            free_cells += len(row) - sum(row)
+            if control is not None:
+                control.check()
 
         if not free_cells:
             return True
 
         start_x, start_y = self.entry
-        visited = [
-            [False for _ in range(self.width)]
-            for _ in range(self.height)
-        ]
+        visited = self._visited
+        clear_flags(visited)
         visited[start_y][start_x] = True
 
         queue = deque([(start_x, start_y)])
@@ -137,44 +358,307 @@ class MazeGenerator:
                 visited[ny][nx] = True
                 count += 1
                 queue.append((nx, ny))
+                if control is not None and count % control.interval == 0:
+                    control.check()
+
+        return count == free_cells
+
+    def _cache_key(self, margin: int) -> Optional[str]:
+        """Return the cache key of this configuration, if cacheable."""
+        if self.cache is None or self.seed is None:
+            return None
+        carver = self._carver
+        return MazeCache.key(
+            carver_backend=(
+                carver.backend
+                if isinstance(carver, (BinaryTreeCarver, SidewinderCarver))
+                else "python"
+            ),
+            width=self.width,
+            height=self.height,
+            entry=list(self.entry),
+            exit=list(self.exit),
+            perfect=self.perfect,
+            seed=self.seed,
+            algorithm=self.algorithm,
+            tile_size=self.tile_size,
+            margin=margin,
+            mask=self.mask.digest,
+            mask_max_scale=self.mask_max_scale,
+            braid=self.braid,
+        )
 
-        return count == len(free_cells)
+    def _load_cached(self, cached: CachedMaze, margin: int) -> None:
+        """Restore grid, mask and solution from a cache entry."""
+        self.grid.load_bytes(cached.cells)
+        unpack_flags(self.blocked, cached.blocked)
+        self._mask_key = (self.width, self.height, margin)
+        self._solution = cached.solution
+        self._solution_known = True
+
+    def _checkpoint_fingerprint(self, margin: int) -> str:
+        """Return the fingerprint of this generation request."""
+        return fingerprint(
+            width=self.width,
+            height=self.height,
+            entry=list(self.entry),
+            exit=list(self.exit),
+            perfect=self.perfect,
+            seed=self.seed,
+            algorithm=self.algorithm,
+            margin=margin,
+            mask=self.mask.digest,
+            mask_max_scale=self.mask_max_scale,
+            braid=self.braid,
+        )
 
-    def generate(self, margin: int = 1) -> None:
-        """Run the full maze generation pipeline."""
-        self.blocked = Mask42Builder(margin=margin).build(
-            self.width,
-            self.height,
+    def _save_checkpoint(
+        self,
+        stack: Union[List[Coord], MappedStack],
+        margin: int,
+    ) -> None:
+        """Write the current carve state to the checkpoint file.
+
+        Mapped cells, visited bitmap and stack are written straight from
+        their buffers, without a copy in RAM.
+        """
+        if self.checkpoint_path is None:
+            return
+        cells = self.grid.buffer
+        write_checkpoint(
+            self.checkpoint_path,
+            Checkpoint(
+                self._checkpoint_fingerprint(margin),
+                self.width,
+                self.height,
+                self.grid.to_bytes() if cells is None else cells,
+                (
+                    self._visited.buffer
+                    if isinstance(self._visited, PackedBitmap)
+                    else pack_flags(self._visited)
+                ),
+                (
+                    stack.buffer
+                    if isinstance(stack, MappedStack)
+                    else pack_stack(stack, self.width)
+                ),
+                self.rng.getstate(),
+            ),
         )
 
+    def _carve_stack(
+        self,
+        saved: BytesLike,
+    ) -> Union[List[Coord], MappedStack]:
+        """Return the DFS stack, holding a restored one if given.
+
+        The mmap backend keeps the stack in a mapped file of flat indices
+        and copies a restored stack into it buffer to buffer.
+        """
+        if self.backend != "mmap":
+            return unpack_stack(saved, self.width)
+        if self._stack is None:
+            self._stack = MappedStack.mapped(
+                self.width, self.height, self._storage_file("stack.bin")
+            )
+        self._stack.load(saved)
+        return self._stack
+
+    def _resume_checkpoint(self, margin: int) -> BytesLike:
+        """Restore a saved carve state; return its raw stack, or b""."""
+        if self.checkpoint_path is None:
+            return b""
+        saved = load_checkpoint(self.checkpoint_path)
+        if saved is None:
+            return b""
+        if saved.fingerprint != self._checkpoint_fingerprint(margin):
+            raise ValueError(
+                f"Checkpoint '{self.checkpoint_path}' was written for "
+                "different maze settings."
+            )
+        self.grid.load_bytes(saved.cells)
+        unpack_flags(self._visited, saved.visited)
+        self.rng.setstate(saved.rng_state)
+        return saved.stack
+
+    def generate(
+        self,
+        margin: int = 1,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Run the full maze generation pipeline.
+
+        A ``control`` bounds the run with a deadline or cancellation
+        token (raising ``GenerationCancelled``) and receives progress.
+        """
+        for _changed in self.iter_generate(margin, control):
+            pass
+
+    def start_generation(
+        self,
+        margin: int = 1,
+        control: Optional[RunControl] = None,
+    ) -> StepRunner:
+        """Return a runner that generates in bounded slices."""
+        return StepRunner(self.iter_generate(margin, control))
+
+    def iter_generate(
+        self,
+        margin: int = 1,
+        control: Optional[RunControl] = None,
+    ) -> Iterator[Changes]:
+        """Run the ``generate()`` pipeline one step at a time.
+
+        DFS carving and loop adding yield the cells each step changed;
+        the grid reset, a cache hit and one-shot carvers yield None.
+        Exhausting the iterator leaves exactly the maze ``generate()``
+        builds.
+        """
+        self._solution = None
+        self._solution_known = False
+
+        builder = MaskBuilder(self.mask, margin, self.mask_max_scale)
+        layout = builder.layout(self.width, self.height)
+        self.mask_warnings = layout.warnings
+        if not layout.connected:
+            raise ValueError(
+                f"The '{self.mask.name}' mask splits the free cells into "
+                "separate regions."
+            )
+
+        key = self._cache_key(margin)
+        if key is not None and self.cache is not None:
+            cached = self.cache.load(key)
+            if cached is not None and (cached.width, cached.height) == (
+                self.width,
+                self.height,
+            ):
+                self._load_cached(cached, margin)
+                yield None
+                return
+
+        if control is not None:
+            control.check()
+        mask_key = (self.width, self.height, margin)
+        if self._mask_key != mask_key:
+            builder.build_into(self.blocked, self.width, self.height)
+            self._mask_key = mask_key
+
         start_x, start_y = self.entry
         exit_x, exit_y = self.exit
 
         if self.blocked[start_y][start_x]:
-            raise ValueError("ENTRY is inside the '42' pattern.")
+            raise ValueError(
+                f"ENTRY is inside the '{self.mask.name}' pattern."
+            )
         if self.blocked[exit_y][exit_x]:
-            raise ValueError("EXIT is inside the '42' pattern.")
+            raise ValueError(
+                f"EXIT is inside the '{self.mask.name}' pattern."
+            )
 
-        self.grid.reset()
-        self._carver.carve(self.grid, start_x, start_y, self.blocked)
+        stack = self._carve_stack(self._resume_checkpoint(margin))
+        if not stack:
+            if control is not None:
+                control.check()
+            self.grid.reset()
+        yield None
+        if isinstance(self._carver, DFSMazeCarver):
+            if not stack:
+                if control is not None:
+                    control.check()
+                clear_flags(self._visited)
+            since_checkpoint = 0
+            for changed in self._carver.iter_carve(
+                self.grid,
+                start_x,
+                start_y,
+                self.blocked,
+                self._visited,
+                control,
+                stack,
+            ):
+                since_checkpoint += 1
+                if (
+                    self.checkpoint_path is not None
+                    and since_checkpoint >= self.checkpoint_every
+                ):
+                    self._save_checkpoint(stack, margin)
+                    since_checkpoint = 0
+                yield changed
+        else:
+            if control is not None:
+                control.check()
+            self._carver.carve(
+                self.grid, start_x, start_y, self.blocked, control=control
+            )
+            yield None
+        if control is not None:
+            control.check()
 
-        if not self._check_connectivity():
+        if not self._check_connectivity(control):
             raise RuntimeError(
                 "Maze connectivity error: some free cells are unreachable."
             )
 
-        if not self.perfect:
-            self._loop_adder.add_loops(self.grid, self.blocked)
+        if self.braid is not None:
+            yield from self._loop_adder.iter_braid(
+                self.grid,
+                self.blocked,
+                self.braid,
+                control=control,
+            )
+        elif not self.perfect:
+            yield from self._loop_adder.iter_add_loops(
+                self.grid,
+                self.blocked,
+                control=control,
+            )
+
+        if key is not None and self.cache is not None:
+            self.cache.store(
+                key,
+                CachedMaze(
+                    self.width,
+                    self.height,
+                    self.grid.to_bytes(),
+                    pack_flags(self.blocked),
+                    self.solve(control),
+                ),
+            )
+
+        if self.checkpoint_path is not None:
+            try:
+                os.remove(self.checkpoint_path)
+            except FileNotFoundError:
+                pass
 
-    def solve(self) -> Optional[str]:
+    def solve(self, control: Optional[RunControl] = None) -> Optional[str]:
         """Return one shortest valid solution."""
+        if self._solution_known:
+            return self._solution
+
         solver = MazeSolver(
             grid=self.grid.cells,
             entry=self.entry,
             exit_=self.exit,
             blocked=self.blocked,
+            scratch=self._solver_scratch(),
+            control=control,
         )
-        return solver.solve()
+        self._solution = solver.solve()
+        self._solution_known = True
+        return self._solution
+
+    def _solver_scratch(self) -> Scratch:
+        """Return the solver move buffer, allocating it once."""
+        if self._scratch is None:
+            size = self.width * self.height
+            self._scratch = (
+                map_file(self._storage_file("moves.bin"), size)
+                if self.backend == "mmap"
+                else bytearray(size)
+            )
+        return self._scratch
 
     def get_solution(self) -> Optional[str]:
         """Return one shortest valid solution."""
@@ -186,23 +670,34 @@ class MazeGenerator:
 
     def get_grid(self) -> List[List[int]]:
         """Return the raw maze grid."""
-        return [row[:] for row in self.grid.cells]
+        return [list(row) for row in self.grid.cells]
 
     def get_blocked_mask(self) -> List[List[bool]]:
-        """Return the blocked '42' mask."""
-        return [row[:] for row in self.blocked]
+        """Return the blocked pattern mask."""
+        return [list(row) for row in self.blocked]
 
-    def build_output_text(self) -> str:
-        """Return the text content expected by the project output."""
+    def iter_output(self, chunk_size: int = OUTPUT_CHUNK) -> Iterator[bytes]:
+        """Yield the output file content in chunks of about chunk_size.
+
+        See ``iter_output_chunks()``.
+        """
         solution = self.solve()
         if solution is None:
             raise RuntimeError("No valid solution exists for this maze.")
 
-        entry_line = f"{self.entry[0]},{self.entry[1]}"
-        exit_line = f"{self.exit[0]},{self.exit[1]}"
-        return (
-            f"{self.to_hex_string()}\n\n"
-            f"{entry_line}\n"
-            f"{exit_line}\n"
-            f"{solution}\n"
+        yield from iter_output_chunks(
+            self.grid, self.entry, self.exit, solution, chunk_size
         )
+
+    def write_output(
+        self,
+        fp: IO[bytes],
+        chunk_size: int = OUTPUT_CHUNK,
+    ) -> None:
+        """Stream the output file content to a binary file object."""
+        for chunk in self.iter_output(chunk_size):
+            fp.write(chunk)
+
+    def build_output_text(self) -> str:
+        """Return the text content expected by the project output."""
+        return b"".join(self.iter_output()).decode("ascii")
@@ -2,29 +2,132 @@
 
 from __future__ import annotations
 
-from typing import List
+import mmap
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
 from .constants import ALL_WALLS
+from .storage import CellRow, map_file
+
+Buffer = Union[bytearray, memoryview, mmap.mmap]
+
+# Maps a cell value (0-15) to its lowercase hexadecimal digit.
+HEX_DIGITS = bytes.maketrans(bytes(range(16)), b"0123456789abcdef")
+OUTPUT_CHUNK = 1 << 16
 
 
 class MazeGrid:
-    """Store maze cells and low-level wall operations."""
+    """Store maze cells and low-level wall operations.
 
-    def __init__(self, width: int, height: int) -> None:
+    Cells are nested lists by default.  When a writable ``buffer`` of at
+    least ``width * height`` bytes is given, each row is a memoryview over
+    it instead (one byte per cell), so the grid can live in a mapped file
+    or a shared memory block without changing ``cells[y][x]`` access.
+    Pass ``clear=False`` to wrap a buffer that already holds a maze.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        buffer: Optional[Buffer] = None,
+        clear: bool = True,
+    ) -> None:
         """Create a grid filled with closed cells."""
         if width <= 0 or height <= 0:
             raise ValueError("width and height must be positive.")
         self.width = width
         self.height = height
-        self.cells: List[List[int]] = []
-        self.reset()
+        self.cells: List[CellRow] = []
+        self._view: Optional[memoryview] = None
+
+        if buffer is not None:
+            view = memoryview(buffer).cast("B")
+            if len(view) < width * height:
+                raise ValueError("Buffer is too small for the grid.")
+            self._view = view[:width * height]
+            self.cells = [
+                self._view[y * width:(y + 1) * width]
+                for y in range(height)
+            ]
+        if buffer is None or clear:
+            self.reset()
+
+    @classmethod
+    def mapped(cls, width: int, height: int, path: str) -> "MazeGrid":
+        """Create a grid stored in a memory-mapped file."""
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive.")
+        return cls(width, height, map_file(path, width * height))
+
+    @property
+    def buffer(self) -> Optional[memoryview]:
+        """Return the flat cell bytes, or None for list storage."""
+        return self._view
 
     def reset(self) -> None:
-        """Reset all cells to fully closed walls."""
-        self.cells = [
-            [ALL_WALLS for _ in range(self.width)]
-            for _ in range(self.height)
-        ]
+        """Reset all cells to fully closed walls, reusing existing rows."""
+        if self._view is None and not self.cells:
+            self.cells = [
+                [ALL_WALLS] * self.width for _ in range(self.height)
+            ]
+            return
+
+        closed = bytes([ALL_WALLS]) * self.width
+        for y in range(self.height):
+            self.write_row(y, 0, closed)
+
+    def write_row(self, y: int, x0: int, values: bytes) -> None:
+        """Overwrite consecutive cells of one row."""
+        row = self.cells[y]
+        if isinstance(row, (list, memoryview)):
+            row[x0:x0 + len(values)] = values
+            return
+        for offset, value in enumerate(values):
+            row[x0 + offset] = value
+
+    def load_rows(self, rows: Sequence[Sequence[int]]) -> None:
+        """Replace all cells with precomputed wall values."""
+        if len(rows) != self.height:
+            raise ValueError("Row count does not match grid height.")
+        if any(len(row) != self.width for row in rows):
+            raise ValueError("Row length does not match grid width.")
+        if self._view is None:
+            self.cells = [list(row) for row in rows]
+            return
+        for y, row in enumerate(rows):
+            self.write_row(y, 0, bytes(row))
+
+    def to_bytes(self) -> bytes:
+        """Return the cells as one byte per cell, row-major."""
+        if self._view is not None:
+            return self._view.tobytes()
+        return b"".join(bytes(row) for row in self.cells)
+
+    def load_bytes(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+    ) -> None:
+        """Replace all cells from one byte per cell, row-major."""
+        width = self.width
+        if len(data) != width * self.height:
+            raise ValueError("Cell data does not match the grid size.")
+        if self._view is not None:
+            self._view[:] = data
+            return
+        self.load_rows([
+            data[y * width:(y + 1) * width] for y in range(self.height)
+        ])
+
+    def release(self) -> None:
+        """Drop the buffer views so the owner can be closed."""
+        if self._view is None:
+            return
+        for row in self.cells:
+            if isinstance(row, memoryview):
+                row.release()
+        self.cells = []
+        self._view.release()
+        self._view = None
 
     def in_bounds(self, x: int, y: int) -> bool:
         """Return True if coordinates are inside the grid."""
@@ -43,9 +146,55 @@ class MazeGrid:
         self.cells[y][x] &= ~(1 << b_curr)
         self.cells[ny][nx] &= ~(1 << b_next)
 
+    def iter_hex_rows(self) -> Iterator[str]:
+        """Yield the grid one hexadecimal row at a time."""
+        for row in self.cells:
+            yield bytes(row).translate(HEX_DIGITS).decode("ascii")
+
+    def iter_hex_chunks(
+        self,
+        chunk_size: int = OUTPUT_CHUNK,
+    ) -> Iterator[bytes]:
+        """Yield newline-terminated hex rows, about chunk_size bytes each.
+
+        Whole blocks of rows are converted with one ``bytes.translate``
+        through ``HEX_DIGITS``; a chunk always holds at least one row.
+        """
+        width = self.width
+        rows_per_chunk = max(1, chunk_size // (width + 1))
+        for y0 in range(0, self.height, rows_per_chunk):
+            y1 = min(self.height, y0 + rows_per_chunk)
+            if self._view is not None:
+                block = self._view[y0 * width:y1 * width].tobytes()
+            else:
+                block = b"".join(bytes(row) for row in self.cells[y0:y1])
+            digits = block.translate(HEX_DIGITS)
+            yield b"".join(
+                digits[start:start + width] + b"\n"
+                for start in range(0, len(digits), width)
+            )
+
     def to_hex_string(self) -> str:
         """Return the grid as hexadecimal rows."""
-        return "\n".join(
-            "".join(format(cell, "x") for cell in row)
-            for row in self.cells
-        )
+        return b"".join(self.iter_hex_chunks())[:-1].decode("ascii")
+
+
+def iter_output_chunks(
+    grid: MazeGrid,
+    entry: Tuple[int, int],
+    exit_: Tuple[int, int],
+    solution: str,
+    chunk_size: int = OUTPUT_CHUNK,
+) -> Iterator[bytes]:
+    """Yield the project output file in chunks of about chunk_size.
+
+    The maze rows are hex-encoded a block at a time, so the whole text
+    never has to exist in memory at once.
+    """
+    yield from grid.iter_hex_chunks(chunk_size)
+    entry_line = f"{entry[0]},{entry[1]}"
+    exit_line = f"{exit_[0]},{exit_[1]}"
+    yield f"\n{entry_line}\n{exit_line}\n".encode("ascii")
+    for start in range(0, len(solution), chunk_size):
+        yield solution[start:start + chunk_size].encode("ascii")
+    yield b"\n"
@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 import random
-from typing import List, Optional
+from typing import Iterator, List, Optional, Set, Tuple
 
-from .constants import DIRS
+from .constants import ALL_WALLS, DIRS
 from .grid import MazeGrid
+from .limits import RunControl
+from .stepwise import Changes
+from .storage import FlagRows
+
+Coord = Tuple[int, int]
+
+# Cell values with exactly one open wall.
+DEAD_END_VALUES = frozenset(
+    ALL_WALLS & ~(1 << b_curr) for _dx, _dy, b_curr, _b_next in DIRS
+)
 
 
 class LoopAdder:
@@ -15,6 +25,7 @@ class LoopAdder:
     def __init__(self, rng: random.Random) -> None:
         """Store the random generator."""
         self.rng = rng
+        self.braided = 0
 
     def _is_open_to(self, grid: MazeGrid, x: int, y: int, bit: int) -> bool:
         """Return True if the wall in one direction is open."""
@@ -23,7 +34,7 @@ class LoopAdder:
     def _creates_open_3x3(
         self,
         grid: MazeGrid,
-        blocked: List[List[bool]],
+        blocked: FlagRows,
         cx: int,
         cy: int,
     ) -> bool:
@@ -89,11 +100,34 @@ class LoopAdder:
     def add_loops(
         self,
         grid: MazeGrid,
-        blocked: List[List[bool]],
+        blocked: FlagRows,
         loops: Optional[int] = None,
         max_tries_multiplier: int = 30,
+        control: Optional[RunControl] = None,
     ) -> None:
-        """Open extra walls without creating a 3x3 open block."""
+        """Open extra walls without creating a 3x3 open block.
+
+        A ``control`` is checked every ``control.interval`` attempts and
+        given the number of loops opened so far.
+        """
+        for _changed in self.iter_add_loops(
+            grid, blocked, loops, max_tries_multiplier, control
+        ):
+            pass
+
+    def iter_add_loops(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        loops: Optional[int] = None,
+        max_tries_multiplier: int = 30,
+        control: Optional[RunControl] = None,
+    ) -> Iterator[Changes]:
+        """Add loops like ``add_loops()``, yielding once per attempt.
+
+        An attempt that opens a wall yields its two cells, any other
+        attempt yields an empty tuple.
+        """
         free_cells = sum(
             1
             for y in range(grid.height)
@@ -112,21 +146,27 @@ class LoopAdder:
 
         while opened < loops and tries < max_tries:
             tries += 1
+            if control is not None and tries % control.interval == 0:
+                control.update("loops", opened, loops)
 
             x = self.rng.randrange(grid.width)
             y = self.rng.randrange(grid.height)
             if blocked[y][x]:
+                yield ()
                 continue
 
             dx, dy, b_curr, b_next = self.rng.choice(DIRS)
             nx, ny = x + dx, y + dy
 
             if not grid.in_bounds(nx, ny):
+                yield ()
                 continue
             if blocked[ny][nx]:
+                yield ()
                 continue
 
             if (grid.cells[y][x] & (1 << b_curr)) == 0:
+                yield ()
                 continue
 
             grid.break_wall(x, y, nx, ny, b_curr, b_next)
@@ -136,6 +176,103 @@ class LoopAdder:
                 or self._creates_open_3x3(grid, blocked, nx, ny)
             ):
                 self._close_wall(grid, x, y, nx, ny, b_curr, b_next)
+                yield ()
                 continue
 
             opened += 1
+            yield ((x, y), (nx, ny))
+
+        if control is not None:
+            control.update("loops", opened, loops)
+
+    def braid(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        fraction: float = 1.0,
+        control: Optional[RunControl] = None,
+    ) -> int:
+        """Remove a fraction of the dead ends; return how many went.
+
+        See ``iter_braid()``.
+        """
+        for _changed in self.iter_braid(grid, blocked, fraction, control):
+            pass
+        return self.braided
+
+    def iter_braid(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        fraction: float = 1.0,
+        control: Optional[RunControl] = None,
+    ) -> Iterator[Changes]:
+        """Open one wall of dead ends until ``fraction`` of them are gone.
+
+        Dead ends are indexed in one scan of the cells and visited in a
+        shuffled order.  Each one gets a wall opened, preferring a
+        neighbour that is itself a dead end, so one opening can remove
+        two.  Openings that would create a 3x3 open area or reach a
+        blocked cell are skipped.  The index is updated as walls open,
+        so the work after the scan is linear in the number of dead ends.
+        Yields like ``iter_add_loops()``; ``self.braided`` holds the
+        number of dead ends removed so far.
+        """
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction must be between 0 and 1.")
+
+        dead: Set[Coord] = set()
+        for y, row in enumerate(grid.cells):
+            blocked_row = blocked[y]
+            for x, value in enumerate(row):
+                if value in DEAD_END_VALUES and not blocked_row[x]:
+                    dead.add((x, y))
+
+        order = sorted(dead)
+        self.rng.shuffle(order)
+        target = round(fraction * len(order))
+        self.braided = 0
+
+        for tries, (x, y) in enumerate(order, 1):
+            if self.braided >= target:
+                break
+            if control is not None and tries % control.interval == 0:
+                control.update("braid", self.braided, target)
+            if (x, y) not in dead:
+                continue
+
+            preferred: List[Tuple[int, int, int, int]] = []
+            others: List[Tuple[int, int, int, int]] = []
+            for dx, dy, b_curr, b_next in DIRS:
+                nx, ny = x + dx, y + dy
+                if not grid.in_bounds(nx, ny) or blocked[ny][nx]:
+                    continue
+                if (grid.cells[y][x] & (1 << b_curr)) == 0:
+                    continue
+                if (nx, ny) in dead:
+                    preferred.append((nx, ny, b_curr, b_next))
+                else:
+                    others.append((nx, ny, b_curr, b_next))
+            self.rng.shuffle(preferred)
+            self.rng.shuffle(others)
+
+            for nx, ny, b_curr, b_next in preferred + others:
+                grid.break_wall(x, y, nx, ny, b_curr, b_next)
+                if (
+                    self._creates_open_3x3(grid, blocked, x, y)
+                    or self._creates_open_3x3(grid, blocked, nx, ny)
+                ):
+                    self._close_wall(grid, x, y, nx, ny, b_curr, b_next)
+                    continue
+                dead.discard((x, y))
+                self.braided += 1
+                if (nx, ny) in dead:
+                    dead.discard((nx, ny))
+                    self.braided += 1
+                yield ((x, y), (nx, ny))
+                break
+            else:
+                yield ()
+
+        if control is not None:
+            control.update("braid", self.braided, target)
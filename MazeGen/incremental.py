@@ -0,0 +1,266 @@
+"""Shortest path kept up to date across single wall edits."""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from .constants import DIRS
+from .grid import MazeGrid
+from .solver import DIR_LETTERS
+from .storage import FlagRows
+
+Coord = Tuple[int, int]
+
+DIR_INDEX: Dict[str, int] = {
+    DIR_LETTERS[(dx, dy)]: index
+    for index, (dx, dy, _b_curr, _b_next) in enumerate(DIRS)
+}
+
+
+class IncrementalSolver:
+    """Maintain the BFS distance field from the entry under wall edits.
+
+    Opening a wall only lowers distances, so the change is pushed
+    outwards from the cell that got closer.  Closing a wall can only raise
+    distances of cells whose every shortest route used that wall; those
+    cells are collected level by level, cleared, and re-settled from their
+    unaffected neighbours.  Cells outside the affected region are never
+    touched.
+
+    ``path()`` walks the field back from the exit, taking the first
+    neighbour in N, E, S, W order that is one step closer, so it is a
+    shortest path but may differ from ``MazeSolver.solve()`` on ties.
+    """
+
+    def __init__(
+        self,
+        grid: MazeGrid,
+        entry: Coord,
+        exit_: Coord,
+        blocked: Optional[FlagRows] = None,
+    ) -> None:
+        """Store the maze and compute the initial distance field."""
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+        self.entry = entry
+        self.exit = exit_
+        self.blocked = blocked
+
+        for name, (x, y) in (("ENTRY", entry), ("EXIT", exit_)):
+            if not grid.in_bounds(x, y):
+                raise ValueError(f"{name} {(x, y)} is out of bounds.")
+            if blocked is not None and blocked[y][x]:
+                raise ValueError(f"{name} is inside a blocked cell.")
+
+        self.unreachable = self.width * self.height
+        self.dist = array("i", [self.unreachable]) * self.unreachable
+        self.rebuild()
+
+    def _is_blocked(self, x: int, y: int) -> bool:
+        """Return True if a cell is part of the blocked mask."""
+        return self.blocked is not None and bool(self.blocked[y][x])
+
+    def _open_neighbors(self, x: int, y: int) -> List[Coord]:
+        """Return the free cells reachable from one cell in one step."""
+        cell = self.grid.cells[y][x]
+        found: List[Coord] = []
+        for dx, dy, b_curr, _b_next in DIRS:
+            if cell & (1 << b_curr):
+                continue
+            nx, ny = x + dx, y + dy
+            if not self.grid.in_bounds(nx, ny) or self._is_blocked(nx, ny):
+                continue
+            found.append((nx, ny))
+        return found
+
+    def rebuild(self) -> None:
+        """Recompute the whole distance field with a full BFS."""
+        width = self.width
+        dist = self.dist
+        for index in range(len(dist)):
+            dist[index] = self.unreachable
+
+        sx, sy = self.entry
+        dist[sy * width + sx] = 0
+        queue = deque([self.entry])
+        while queue:
+            x, y = queue.popleft()
+            step = dist[y * width + x] + 1
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny * width + nx] > step:
+                    dist[ny * width + nx] = step
+                    queue.append((nx, ny))
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """Return the BFS distance of one cell, or None if unreachable."""
+        value = self.dist[y * self.width + x]
+        return None if value == self.unreachable else value
+
+    def path(self) -> Optional[str]:
+        """Return a shortest entry-to-exit path as N/E/S/W letters."""
+        width = self.width
+        dist = self.dist
+        x, y = self.exit
+        if dist[y * width + x] == self.unreachable:
+            return None
+
+        letters: List[str] = []
+        while (x, y) != self.entry:
+            target = dist[y * width + x] - 1
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny * width + nx] == target:
+                    letters.append(DIR_LETTERS[(x - nx, y - ny)])
+                    x, y = nx, ny
+                    break
+            else:
+                raise RuntimeError("Distance field is inconsistent.")
+
+        letters.reverse()
+        return "".join(letters)
+
+    def open_wall(self, x: int, y: int, direction: str) -> Optional[str]:
+        """Open one wall of a cell and return the updated path."""
+        return self._edit(x, y, direction, True)
+
+    def close_wall(self, x: int, y: int, direction: str) -> Optional[str]:
+        """Close one wall of a cell and return the updated path."""
+        return self._edit(x, y, direction, False)
+
+    def _edit(
+        self,
+        x: int,
+        y: int,
+        direction: str,
+        opened: bool,
+    ) -> Optional[str]:
+        """Change the wall on both sides, then repair the field.
+
+        Walls of blocked cells are never edited: they must stay closed
+        for the maze output to keep showing them as ``f``.
+        """
+        nx, ny, b_curr, b_next = self._neighbor(x, y, direction)
+        if self._is_blocked(x, y) or self._is_blocked(nx, ny):
+            raise ValueError("Cannot edit a wall of a blocked cell.")
+        cells = self.grid.cells
+        if opened:
+            cells[y][x] &= ~(1 << b_curr)
+            cells[ny][nx] &= ~(1 << b_next)
+        else:
+            cells[y][x] |= 1 << b_curr
+            cells[ny][nx] |= 1 << b_next
+        self.wall_changed(x, y, direction)
+        return self.path()
+
+    def _neighbor(
+        self,
+        x: int,
+        y: int,
+        direction: str,
+    ) -> Tuple[int, int, int, int]:
+        """Return the neighbour and wall bits across one wall."""
+        if direction not in DIR_INDEX:
+            raise ValueError(f"Unknown direction '{direction}'.")
+        dx, dy, b_curr, b_next = DIRS[DIR_INDEX[direction]]
+        nx, ny = x + dx, y + dy
+        if not self.grid.in_bounds(x, y) or not self.grid.in_bounds(nx, ny):
+            raise ValueError("Wall is not between two cells of the grid.")
+        return nx, ny, b_curr, b_next
+
+    def wall_changed(self, x: int, y: int, direction: str) -> None:
+        """Repair the field after one wall was edited in the grid."""
+        nx, ny, b_curr, _b_next = self._neighbor(x, y, direction)
+        if self._is_blocked(x, y) or self._is_blocked(nx, ny):
+            return
+
+        if self.grid.cells[y][x] & (1 << b_curr):
+            self._wall_closed((x, y), (nx, ny))
+        else:
+            self._wall_opened((x, y), (nx, ny))
+
+    def _wall_opened(self, a: Coord, b: Coord) -> None:
+        """Lower distances reachable through a newly opened wall."""
+        width = self.width
+        dist = self.dist
+        da = dist[a[1] * width + a[0]]
+        db = dist[b[1] * width + b[0]]
+        if da > db:
+            a, b = b, a
+            da, db = db, da
+        if da + 1 >= db:
+            return
+
+        dist[b[1] * width + b[0]] = da + 1
+        queue = deque([b])
+        while queue:
+            x, y = queue.popleft()
+            step = dist[y * width + x] + 1
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny * width + nx] > step:
+                    dist[ny * width + nx] = step
+                    queue.append((nx, ny))
+
+    def _wall_closed(self, a: Coord, b: Coord) -> None:
+        """Raise distances that depended on a newly closed wall."""
+        width = self.width
+        dist = self.dist
+        unreachable = self.unreachable
+        da = dist[a[1] * width + a[0]]
+        db = dist[b[1] * width + b[0]]
+        if da > db:
+            a, b = b, a
+            da, db = db, da
+        if db == unreachable or db != da + 1:
+            return
+
+        # Cells are collected in increasing distance, so every possible
+        # support of a candidate is already classified when it is checked.
+        affected: Set[Coord] = set()
+        queue = deque([b])
+        while queue:
+            x, y = queue.popleft()
+            if (x, y) in affected:
+                continue
+            level = dist[y * width + x]
+            supported = any(
+                dist[ny * width + nx] == level - 1
+                and (nx, ny) not in affected
+                for nx, ny in self._open_neighbors(x, y)
+            )
+            if supported:
+                continue
+            affected.add((x, y))
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny * width + nx] == level + 1:
+                    queue.append((nx, ny))
+
+        if not affected:
+            return
+
+        for x, y in affected:
+            dist[y * width + x] = unreachable
+
+        heap: List[Tuple[int, int, int]] = []
+        for x, y in affected:
+            best = min(
+                (
+                    dist[ny * width + nx]
+                    for nx, ny in self._open_neighbors(x, y)
+                ),
+                default=unreachable,
+            )
+            if best < unreachable:
+                dist[y * width + x] = best + 1
+                heapq.heappush(heap, (best + 1, x, y))
+
+        while heap:
+            level, x, y = heapq.heappop(heap)
+            if level > dist[y * width + x]:
+                continue
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny * width + nx] > level + 1:
+                    dist[ny * width + nx] = level + 1
+                    heapq.heappush(heap, (level + 1, nx, ny))
@@ -0,0 +1,120 @@
+"""Deadlines, cancellation and memory budgets for long runs."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Peak traced bytes per cell of generate() plus solve(), measured on
+# 200x200 and 400x400 mazes and rounded up.  The DFS stack is the part
+# that varies most, so the DFS figures keep extra headroom.
+_BYTES_PER_CELL: Dict[Tuple[str, str], int] = {
+    ("dfs", "memory"): 64,
+    ("dfs", "mmap"): 4,
+    ("dfs_lean", "memory"): 32,
+    ("dfs_lean", "mmap"): 8,
+    ("sidewinder", "memory"): 96,
+    ("sidewinder", "mmap"): 88,
+    ("binary_tree", "memory"): 80,
+    ("binary_tree", "mmap"): 72,
+}
+_BASE_BYTES = 1024 * 1024
+
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class GenerationCancelled(RuntimeError):
+    """Raised when a run is cancelled through its token."""
+
+
+class DeadlineExceeded(GenerationCancelled):
+    """Raised when a run passes its deadline."""
+
+
+class CancelToken:
+    """Flag another thread can set to stop a running generation."""
+
+    def __init__(self) -> None:
+        """Create a token that is not cancelled."""
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Return True once cancel() was called."""
+        return self._event.is_set()
+
+
+class RunControl:
+    """Deadline, cancellation token and progress callback for one run.
+
+    Long loops call ``update()`` every ``interval`` units of work, which
+    raises if the run was cancelled or timed out and then reports
+    ``(stage, done, total)`` to the progress callback.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        token: Optional[CancelToken] = None,
+        progress: Optional[ProgressCallback] = None,
+        interval: int = 4096,
+    ) -> None:
+        """Start the deadline clock now."""
+        if timeout is not None and not timeout > 0:
+            raise ValueError("timeout must be positive.")
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        self.deadline = (
+            None if timeout is None else time.monotonic() + timeout
+        )
+        self.token = token
+        self.progress = progress
+        self.interval = interval
+
+    def check(self) -> None:
+        """Raise if the run was cancelled or is past its deadline."""
+        if self.token is not None and self.token.cancelled:
+            raise GenerationCancelled("Generation was cancelled.")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise DeadlineExceeded("Generation exceeded its deadline.")
+
+    def update(self, stage: str, done: int, total: int) -> None:
+        """Check the limits, then report progress."""
+        self.check()
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+
+def estimate_memory(
+    width: int,
+    height: int,
+    algorithm: str = "dfs",
+    backend: str = "memory",
+) -> int:
+    """Return the estimated peak bytes needed to generate and solve."""
+    per_cell = _BYTES_PER_CELL.get(
+        (algorithm, backend),
+        _BYTES_PER_CELL[("dfs", backend)],
+    )
+    return _BASE_BYTES + width * height * per_cell
+
+
+def check_memory(
+    width: int,
+    height: int,
+    budget: int,
+    algorithm: str = "dfs",
+    backend: str = "memory",
+) -> None:
+    """Raise ValueError if the estimate exceeds a budget in bytes."""
+    needed = estimate_memory(width, height, algorithm, backend)
+    if needed > budget:
+        raise ValueError(
+            f"A {width}x{height} maze needs about {needed // 2 ** 20} MiB, "
+            f"over the {budget // 2 ** 20} MiB memory budget."
+        )
@@ -0,0 +1,412 @@
+"""Blocked-cell masks built from scalable bitmap patterns.
+
+A pattern is a small bitmap, written as text art or read from a PBM
+file, that is scaled and centred inside the maze.  Layouts are computed a
+row at a time: every pattern row is widened once and the same bytes
+object is reused for each of its ``scale`` copies, so even huge masks
+cost a few row objects.  Layouts are cached per (pattern, width, height,
+margin, max_scale); the bit-packed form is produced on demand, one row at
+a time, so cached layouts stay small.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .constants import MAX_SCALE
+from .storage import FlagRows, PackedBitmap
+
+# Maps 0/1 bytes to ASCII digits, to pack a row with int(..., 2).
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+@dataclass(frozen=True)
+class MaskPattern:
+    """Immutable bitmap; each row holds one 0/1 byte per column."""
+
+    name: str
+    rows: Tuple[bytes, ...]
+
+    def __post_init__(self) -> None:
+        """Validate the bitmap shape and values."""
+        if not self.rows or not self.rows[0]:
+            raise ValueError("A mask pattern cannot be empty.")
+        if any(len(row) != len(self.rows[0]) for row in self.rows):
+            raise ValueError("Mask pattern rows must have the same width.")
+        if any(row.strip(b"\x00\x01") for row in self.rows):
+            raise ValueError("Mask pattern rows must only hold 0 and 1.")
+
+    @property
+    def width(self) -> int:
+        """Return the pattern width in cells."""
+        return len(self.rows[0])
+
+    @property
+    def height(self) -> int:
+        """Return the pattern height in cells."""
+        return len(self.rows)
+
+    @property
+    def digest(self) -> str:
+        """Return a stable digest of the bitmap, for cache keys."""
+        blob = f"{self.width}x{self.height}:".encode("ascii")
+        return hashlib.sha256(blob + b"".join(self.rows)).hexdigest()
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        name: str = "mask",
+        blocked: str = "#X1",
+    ) -> "MaskPattern":
+        """Read text art; characters in ``blocked`` mark blocked cells.
+
+        Blank lines around the art are ignored and shorter lines are
+        padded with free cells.
+        """
+        lines = [line.rstrip() for line in text.splitlines()]
+        while lines and not lines[0]:
+            lines.pop(0)
+        while lines and not lines[-1]:
+            lines.pop()
+        width = max((len(line) for line in lines), default=0)
+        rows = tuple(
+            bytes(1 if char in blocked else 0 for char in line.ljust(width))
+            for line in lines
+        )
+        return cls(name, rows)
+
+    @classmethod
+    def from_pbm(cls, data: bytes, name: str = "mask") -> "MaskPattern":
+        """Read a plain (P1) or raw (P4) PBM image; 1 means blocked."""
+        magic = data[:2]
+        if magic not in (b"P1", b"P4"):
+            raise ValueError("Not a PBM image (expected P1 or P4).")
+
+        tokens: List[bytes] = []
+        pos = 2
+        while len(tokens) < 2:
+            while pos < len(data) and data[pos:pos + 1].isspace():
+                pos += 1
+            if data[pos:pos + 1] == b"#":
+                end = data.find(b"\n", pos)
+                pos = len(data) if end < 0 else end + 1
+                continue
+            start = pos
+            while pos < len(data) and not data[pos:pos + 1].isspace():
+                pos += 1
+            if start == pos:
+                raise ValueError("Truncated PBM header.")
+            tokens.append(data[start:pos])
+        try:
+            width, height = int(tokens[0]), int(tokens[1])
+        except ValueError as exc:
+            raise ValueError("Invalid PBM size.") from exc
+        if width <= 0 or height <= 0:
+            raise ValueError("Invalid PBM size.")
+
+        if magic == b"P1":
+            bits = bytes(
+                char - 48
+                for char in data[pos:]
+                if char in (48, 49)
+            )
+            if len(bits) < width * height:
+                raise ValueError("Truncated PBM data.")
+            rows = tuple(
+                bits[y * width:(y + 1) * width] for y in range(height)
+            )
+            return cls(name, rows)
+
+        pos += 1
+        row_bytes = (width + 7) // 8
+        raster = data[pos:pos + row_bytes * height]
+        if len(raster) < row_bytes * height:
+            raise ValueError("Truncated PBM data.")
+        unpacked: List[bytes] = []
+        for y in range(height):
+            packed = raster[y * row_bytes:(y + 1) * row_bytes]
+            digits = format(int.from_bytes(packed, "big"), "b")
+            digits = digits.zfill(row_bytes * 8)[:width]
+            unpacked.append(
+                digits.encode("ascii").translate(
+                    bytes.maketrans(b"01", b"\x00\x01")
+                )
+            )
+        return cls(name, tuple(unpacked))
+
+    @classmethod
+    def load(cls, path: str) -> "MaskPattern":
+        """Read a PBM file, or text art when it has no PBM header."""
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:2] in (b"P1", b"P4"):
+            return cls.from_pbm(data, name=path)
+        return cls.from_text(data.decode("utf-8"), name=path)
+
+
+PATTERN_42 = MaskPattern.from_text(
+    """
+#...###
+#.....#
+###.###
+..#.#..
+..#.###
+""",
+    name="42",
+)
+
+
+@dataclass(frozen=True)
+class MaskWarning:
+    """Diagnostic about a pattern that could not be placed as asked."""
+
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        """Return the message."""
+        return self.message
+
+
+@dataclass(frozen=True)
+class MaskLayout:
+    """A placed pattern: full-size mask rows plus diagnostics.
+
+    ``rows`` reuses one bytes object per distinct row, so a layout costs
+    a few rows plus one pointer per maze row however large the maze is.
+    """
+
+    width: int
+    height: int
+    rows: Tuple[bytes, ...]
+    scale: int
+    warnings: Tuple[MaskWarning, ...] = ()
+    connected: bool = True
+    blocked_cells: int = 0
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Return True if one cell is blocked."""
+        return bool(self.rows[y][x])
+
+    def packed_rows(self) -> Iterator[bytes]:
+        """Yield each row in PackedBitmap bit order, packing it once."""
+        packed: Dict[bytes, bytes] = {}
+        for row in self.rows:
+            bits = packed.get(row)
+            if bits is None:
+                bits = packed[row] = _pack_row(row)
+            yield bits
+
+    @property
+    def packed(self) -> bytes:
+        """Return the whole mask as PackedBitmap bytes (not cached)."""
+        return b"".join(self.packed_rows())
+
+
+class MaskBuilder:
+    """Place a scaled, centred pattern inside a maze."""
+
+    def __init__(
+        self,
+        pattern: MaskPattern = PATTERN_42,
+        margin: int = 1,
+        max_scale: Optional[int] = MAX_SCALE,
+    ) -> None:
+        """Store the pattern, border margin and largest scale factor.
+
+        ``max_scale=None`` lets the pattern grow to fill the maze.
+        """
+        if margin < 0:
+            raise ValueError("margin must be >= 0.")
+        if max_scale is not None and max_scale < 1:
+            raise ValueError("max_scale must be >= 1.")
+        self.pattern = pattern
+        self.margin = margin
+        self.max_scale = max_scale
+
+    def layout(self, width: int, height: int) -> MaskLayout:
+        """Return the cached layout for one maze size."""
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive.")
+        return _layout(
+            self.pattern, width, height, self.margin, self.max_scale
+        )
+
+    def build_into(
+        self,
+        blocked: FlagRows,
+        width: int,
+        height: int,
+    ) -> MaskLayout:
+        """Overwrite every row of a mask with the layout and return it."""
+        layout = self.layout(width, height)
+        if isinstance(blocked, PackedBitmap):
+            buffer = blocked.buffer
+            step = blocked.row_bytes
+            for y, bits in enumerate(layout.packed_rows()):
+                buffer[y * step:(y + 1) * step] = bits
+            return layout
+
+        as_flags: Dict[bytes, List[bool]] = {}
+        for y, row in enumerate(layout.rows):
+            target = blocked[y]
+            if isinstance(target, list):
+                flags = as_flags.get(row)
+                if flags is None:
+                    flags = as_flags[row] = [bool(v) for v in row]
+                target[:] = flags
+            else:
+                for x, value in enumerate(row):
+                    target[x] = bool(value)
+        return layout
+
+
+def _pack_row(row: bytes) -> bytes:
+    """Pack one 0/1 row into PackedBitmap bit order."""
+    value = int(row[::-1].translate(_TO_DIGITS), 2)
+    return value.to_bytes((len(row) + 7) // 8, "little")
+
+
+def _is_connected(rows: Tuple[bytes, ...]) -> bool:
+    """Return True if the free cells form one 4-connected region.
+
+    Works on runs of free cells instead of cells: runs of neighbouring
+    rows that overlap are joined with union-find.
+    """
+    parent: List[int] = []
+
+    def find(node: int) -> int:
+        """Return the root of one run."""
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    previous: List[Tuple[int, int, int]] = []
+    runs_cache: Dict[bytes, List[Tuple[int, int]]] = {}
+    for row in rows:
+        spans = runs_cache.get(row)
+        if spans is None:
+            spans = []
+            x = row.find(0)
+            while x >= 0:
+                end = row.find(1, x)
+                end = len(row) if end < 0 else end
+                spans.append((x, end))
+                x = row.find(0, end)
+            runs_cache[row] = spans
+
+        current: List[Tuple[int, int, int]] = []
+        index = 0
+        for start, end in spans:
+            node = len(parent)
+            parent.append(node)
+            current.append((start, end, node))
+            while index < len(previous) and previous[index][1] <= start:
+                index += 1
+            probe = index
+            while probe < len(previous) and previous[probe][0] < end:
+                root_a, root_b = find(previous[probe][2]), find(node)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+                probe += 1
+        previous = current
+
+    roots = {find(node) for node in range(len(parent))}
+    return len(roots) <= 1
+
+
+@lru_cache(maxsize=32)
+def _layout(
+    pattern: MaskPattern,
+    width: int,
+    height: int,
+    margin: int,
+    max_scale: Optional[int],
+) -> MaskLayout:
+    """Place a pattern; see MaskBuilder.layout."""
+    blank = bytes(width)
+    label = f"[{pattern.name}] Warning:"
+
+    min_w = pattern.width + (2 * margin)
+    min_h = pattern.height + (2 * margin)
+    if width < min_w or height < min_h:
+        return MaskLayout(
+            width,
+            height,
+            (blank,) * height,
+            0,
+            (
+                MaskWarning(
+                    "too_small",
+                    f"{label} maze too small for the '{pattern.name}' "
+                    f"pattern. Need at least {min_w}x{min_h}, got "
+                    f"{width}x{height}. Skipping pattern.",
+                ),
+            ),
+        )
+
+    scale_w = (width - (2 * margin)) // pattern.width
+    scale_h = (height - (2 * margin)) // pattern.height
+    scale = min(scale_w, scale_h)
+    if max_scale is not None:
+        scale = min(scale, max_scale)
+    scale = max(1, scale)
+
+    pat_w = pattern.width * scale
+    pat_h = pattern.height * scale
+    left = (width - pat_w) // 2
+    top = (height - pat_h) // 2
+    right = width - (left + pat_w)
+    bottom = height - (top + pat_h)
+
+    if min(left, top, right, bottom) < margin:
+        return MaskLayout(
+            width,
+            height,
+            (blank,) * height,
+            0,
+            (
+                MaskWarning(
+                    "no_safe_placement",
+                    f"{label} cannot place the '{pattern.name}' pattern "
+                    "safely. Skipping pattern.",
+                ),
+            ),
+        )
+
+    widened = [
+        bytes(left)
+        + b"".join(bytes([value]) * scale for value in row)
+        + bytes(right)
+        for row in pattern.rows
+    ]
+    rows: List[bytes] = [blank] * top
+    for line in widened:
+        rows.extend([line] * scale)
+    rows.extend([blank] * bottom)
+    layout_rows = tuple(rows)
+
+    connected = _is_connected(layout_rows)
+    warnings: Tuple[MaskWarning, ...] = ()
+    if not connected:
+        warnings = (
+            MaskWarning(
+                "disconnects",
+                f"{label} the '{pattern.name}' pattern splits the free "
+                "cells into separate regions.",
+            ),
+        )
+    return MaskLayout(
+        width,
+        height,
+        layout_rows,
+        scale,
+        warnings,
+        connected,
+        sum(row.count(1) for row in pattern.rows) * scale * scale,
+    )
@@ -0,0 +1,111 @@
+"""Per-action cProfile dumps and rolling stage timings."""
+
+from __future__ import annotations
+
+import cProfile
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Optional
+
+
+class ActionProfiler:
+    """Profile user actions and keep the last timings of each stage.
+
+    With an ``out_dir``, ``begin(action)`` starts a cProfile session for
+    that action, every ``collect(action)`` block runs under it, and
+    ``end(action)`` dumps it to ``<out_dir>/<action>-<n>.pstats``.  An
+    action may span several frames, and other actions may begin and end
+    meanwhile: each keeps its own profile.  Stage timings
+    (``timed()``/``record()``) are kept whether or not profiling is
+    enabled, in windows of the last ``window`` values.
+    """
+
+    def __init__(
+        self,
+        out_dir: Optional[str] = None,
+        window: int = 30,
+    ) -> None:
+        """Create the output directory if profiling is enabled."""
+        if window <= 0:
+            raise ValueError("window must be positive.")
+        self.out_dir = out_dir
+        self.window = window
+        self.timings: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._active: Dict[str, cProfile.Profile] = {}
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if pstats files are written."""
+        return self.out_dir is not None
+
+    def begin(self, action: str) -> None:
+        """Start profiling one action.
+
+        Raises RuntimeError if that action is already being profiled.
+        """
+        if self.out_dir is None:
+            return
+        action = action.lower()
+        if action in self._active:
+            raise RuntimeError(f"Action '{action}' is already profiled.")
+        self._active[action] = cProfile.Profile()
+
+    @contextmanager
+    def collect(self, action: str) -> Iterator[None]:
+        """Run a block under one action's profiler, if it is open."""
+        profile = self._active.get(action.lower())
+        if profile is None:
+            yield
+            return
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def end(self, action: str) -> Optional[str]:
+        """Dump one action's stats; return the file written, if any."""
+        action = action.lower()
+        profile = self._active.pop(action, None)
+        if profile is None or self.out_dir is None:
+            return None
+        count = self._counts.get(action, 0) + 1
+        self._counts[action] = count
+        path = os.path.join(self.out_dir, f"{action}-{count:03d}.pstats")
+        profile.dump_stats(path)
+        return path
+
+    def end_all(self) -> List[str]:
+        """Dump every open action; return the files written."""
+        paths = [self.end(action) for action in list(self._active)]
+        return [path for path in paths if path is not None]
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        """Add one timing, in milliseconds, to a stage's window."""
+        if stage not in self.timings:
+            self.timings[stage] = deque(maxlen=self.window)
+        self.timings[stage].append(elapsed_ms)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Record the wall time of a block under one stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def last(self, stage: str) -> Optional[float]:
+        """Return the latest timing of a stage, in milliseconds."""
+        values = self.timings.get(stage)
+        return values[-1] if values else None
+
+    def mean(self, stage: str) -> Optional[float]:
+        """Return the mean of a stage's window, in milliseconds."""
+        values = self.timings.get(stage)
+        return sum(values) / len(values) if values else None
@@ -0,0 +1,588 @@
+"""Local asyncio maze service with request coalescing and an LRU.
+
+The service speaks a minimal HTTP/1.1 over a loopback TCP port or a Unix
+socket::
+
+    POST /generate  {"width": 20, "height": 15, "entry": [0, 0],
+                     "exit": [19, 14], "perfect": true, "seed": 42,
+                     "timeout": 5.0}
+    POST /solve     {"maze": "<hex rows>", "entry": [0, 0],
+                     "exit": [19, 14]}
+    GET  /stats
+
+CPU work runs in a process pool.  Identical deterministic requests that
+arrive while one is being computed share its result, and recent results
+are kept in an in-memory LRU.  Generate requests over the memory budget
+are rejected before reaching a worker, and an optional ``timeout`` (in
+seconds) bounds the generation itself.  A shared job is cancelled, through
+a one-byte flag in shared memory that the worker polls, as soon as its
+last waiting caller gives up.
+
+Run it with ``python -m MazeGen.service --port 8765`` or
+``python -m MazeGen.service --unix /tmp/mazegen.sock``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .generator import CARVERS, MazeGenerator
+from .limits import (
+    CancelToken,
+    DeadlineExceeded,
+    RunControl,
+    check_memory,
+)
+from .solver import MazeSolver
+
+Json = Dict[str, Any]
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+LATENCY_WINDOW = 1024
+
+
+class RequestError(ValueError):
+    """Client error reported as HTTP 400."""
+
+
+def _is_int(value: Any) -> bool:
+    """Return True for a JSON integer; booleans do not count."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _coord(payload: Json, key: str) -> Tuple[int, int]:
+    """Return one [x, y] field as a tuple of two integers."""
+    value = payload.get(key)
+    if (
+        not isinstance(value, (list, tuple))
+        or len(value) != 2
+        or not all(_is_int(v) for v in value)
+    ):
+        raise RequestError(f"'{key}' must be a pair of integers.")
+    return value[0], value[1]
+
+
+class _FlagToken(CancelToken):
+    """Cancel token reading a one-byte flag in shared memory."""
+
+    def __init__(self, name: str) -> None:
+        """Attach to the flag block created by the service."""
+        super().__init__()
+        try:
+            self._shm: Optional[shared_memory.SharedMemory] = (
+                shared_memory.SharedMemory(name=name)
+            )
+        except FileNotFoundError:
+            # The job was abandoned and its flag removed before it ran.
+            self._shm = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Return True once the service set the flag."""
+        if self._shm is None or self._shm.buf is None:
+            return True
+        return bool(self._shm.buf[0])
+
+    def close(self) -> None:
+        """Detach from the flag block."""
+        if self._shm is not None:
+            self._shm.close()
+
+
+def _new_flag() -> shared_memory.SharedMemory:
+    """Return a cleared one-byte cancel flag in shared memory.
+
+    New blocks are zero-filled, so the flag starts unset.
+    """
+    return shared_memory.SharedMemory(create=True, size=1)
+
+
+class _SharedJob:
+    """One coalesced job: its task, cancel flag and waiting callers."""
+
+    def __init__(
+        self,
+        task: "asyncio.Future[Json]",
+        flag: shared_memory.SharedMemory,
+    ) -> None:
+        """Track a running task and the flag its worker polls."""
+        self.task = task
+        self.flag = flag
+        self.waiters = 0
+
+    def cancel(self) -> None:
+        """Ask the worker to stop, and drop the job if not started."""
+        if self.flag.buf is not None:
+            self.flag.buf[0] = 1
+        self.task.cancel()
+
+
+def generate_job(params: Json) -> Json:
+    """Generate one maze; runs in a worker process.
+
+    A ``cancel`` entry names the shared flag the service sets when no
+    caller waits for the result any more.
+    """
+    token = None
+    if params.get("cancel") is not None:
+        token = _FlagToken(params["cancel"])
+    try:
+        control = RunControl(timeout=params.get("timeout"), token=token)
+        control.check()
+        generator = MazeGenerator(
+            params["width"],
+            params["height"],
+            tuple(params["entry"]),
+            tuple(params["exit"]),
+            "<service>",
+            params["perfect"],
+            seed=params.get("seed"),
+            algorithm=params.get("algorithm", "dfs"),
+        )
+        generator.generate(control=control)
+        return {
+            "maze": generator.to_hex_string(),
+            "entry": params["entry"],
+            "exit": params["exit"],
+            "solution": generator.solve(control),
+        }
+    finally:
+        if token is not None:
+            token.close()
+
+
+def solve_job(params: Json) -> Json:
+    """Solve one hexadecimal maze; runs in a worker process."""
+    rows = [
+        [int(char, 16) for char in line]
+        for line in params["maze"].split("\n")
+        if line
+    ]
+    solver = MazeSolver(rows, tuple(params["entry"]), tuple(params["exit"]))
+    return {"solution": solver.solve()}
+
+
+def _generate_params(payload: Json, memory_budget: int) -> Json:
+    """Validate a generate request and return its normalized params."""
+    for key in ("width", "height"):
+        if not _is_int(payload.get(key)):
+            raise RequestError(f"'{key}' must be an integer.")
+    if not isinstance(payload.get("perfect", True), bool):
+        raise RequestError("'perfect' must be a boolean.")
+    seed = payload.get("seed")
+    if seed is not None and not _is_int(seed):
+        raise RequestError("'seed' must be an integer.")
+    if not isinstance(payload.get("algorithm", "dfs"), str):
+        raise RequestError("'algorithm' must be a string.")
+    timeout = payload.get("timeout")
+    if timeout is not None and (
+        isinstance(timeout, bool)
+        or not isinstance(timeout, (int, float))
+        or timeout <= 0
+    ):
+        raise RequestError("'timeout' must be a positive number.")
+
+    params: Json = {
+        "width": payload["width"],
+        "height": payload["height"],
+        "entry": list(_coord(payload, "entry")),
+        "exit": list(_coord(payload, "exit")),
+        "perfect": payload.get("perfect", True),
+        "seed": seed,
+        "algorithm": payload.get("algorithm", "dfs"),
+        "timeout": timeout,
+    }
+    # Fail fast on bad settings without paying for a worker round-trip,
+    # and without allocating the maze on the event-loop thread.
+    MazeGenerator._validate(
+        params["width"],
+        params["height"],
+        tuple(params["entry"]),
+        tuple(params["exit"]),
+        "<service>",
+        params["perfect"],
+    )
+    if params["algorithm"] not in CARVERS:
+        raise RequestError(
+            f"Unknown algorithm '{params['algorithm']}'. "
+            f"Choose one of: {', '.join(sorted(CARVERS))}."
+        )
+    check_memory(
+        params["width"],
+        params["height"],
+        memory_budget,
+        params["algorithm"],
+    )
+    return params
+
+
+def _solve_params(payload: Json) -> Json:
+    """Validate a solve request and return its normalized params."""
+    maze = payload.get("maze")
+    if not isinstance(maze, str) or not maze.strip():
+        raise RequestError("'maze' must be a non-empty hex string.")
+    if any(char not in "0123456789abcdefABCDEF\n" for char in maze):
+        raise RequestError("'maze' must only contain hex digits.")
+    return {
+        "maze": maze.strip(),
+        "entry": list(_coord(payload, "entry")),
+        "exit": list(_coord(payload, "exit")),
+    }
+
+
+class ServiceStats:
+    """Latency and throughput counters."""
+
+    def __init__(self) -> None:
+        """Start counting from now."""
+        self.started = time.monotonic()
+        self.requests = 0
+        self.completed = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.lru_hits = 0
+        self.computed = 0
+        self.total_latency = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Record one finished request."""
+        if ok:
+            self.completed += 1
+        else:
+            self.errors += 1
+        self.total_latency += latency
+        self.latencies.append(latency)
+
+    def snapshot(self) -> Json:
+        """Return the counters as JSON-friendly values."""
+        uptime = time.monotonic() - self.started
+        finished = self.completed + self.errors
+        ordered = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            """Return one latency percentile in milliseconds."""
+            if not ordered:
+                return 0.0
+            index = min(len(ordered) - 1, int(fraction * len(ordered)))
+            return round(ordered[index] * 1000, 3)
+
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "completed": self.completed,
+            "errors": self.errors,
+            "coalesced": self.coalesced,
+            "lru_hits": self.lru_hits,
+            "computed": self.computed,
+            "throughput_rps": round(finished / uptime, 3) if uptime else 0.0,
+            "latency_avg_ms": (
+                round(self.total_latency / finished * 1000, 3)
+                if finished else 0.0
+            ),
+            "latency_p50_ms": percentile(0.50),
+            "latency_p95_ms": percentile(0.95),
+            "latency_max_ms": round(max(ordered, default=0.0) * 1000, 3),
+        }
+
+
+class MazeService:
+    """Dispatch generate/solve requests to a process pool."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache_size: int = 128,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        """Create the pool, the LRU and the counters."""
+        if cache_size < 0:
+            raise ValueError("cache_size must be >= 0.")
+        if memory_budget <= 0:
+            raise ValueError("memory_budget must be positive.")
+        self.memory_budget = memory_budget
+        # Forked workers would inherit open client sockets and delay EOF.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+        )
+        self.cache_size = cache_size
+        self.stats = ServiceStats()
+        self._lru: "OrderedDict[str, Json]" = OrderedDict()
+        self._inflight: Dict[str, _SharedJob] = {}
+
+    def close(self) -> None:
+        """Cancel in-flight jobs and shut the worker pool down."""
+        for shared in list(self._inflight.values()):
+            shared.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _run(
+        self,
+        job: Callable[[Json], Json],
+        params: Json,
+        key: Optional[str],
+        timeout: Optional[float] = None,
+    ) -> Json:
+        """Return a result from the LRU, an in-flight twin or the pool.
+
+        A shared job has no deadline of its own; each caller's ``timeout``
+        only bounds its own wait, so callers never inherit each other's.
+        When the last waiting caller gives up, the job is dropped from the
+        in-flight table and its worker is told to stop.
+        """
+        loop = asyncio.get_running_loop()
+        if key is None:
+            self.stats.computed += 1
+            return await loop.run_in_executor(self.pool, job, params)
+
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.stats.lru_hits += 1
+            return self._lru[key]
+
+        shared = self._inflight.get(key)
+        if shared is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.computed += 1
+            flag = _new_flag()
+            task = asyncio.ensure_future(self._compute(
+                job, dict(params, cancel=flag.name), key, flag
+            ))
+            # Retrieve the outcome even if every caller gave up waiting.
+            task.add_done_callback(
+                lambda done: done.cancelled() or done.exception()
+            )
+            shared = _SharedJob(task, flag)
+            self._inflight[key] = shared
+
+        pending = shared.task
+        shared.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending), timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(
+                "Generation exceeded its deadline."
+            ) from None
+        finally:
+            shared.waiters -= 1
+            if not shared.waiters and not pending.done():
+                if self._inflight.get(key) is shared:
+                    del self._inflight[key]
+                shared.cancel()
+
+    async def _compute(
+        self,
+        job: Callable[[Json], Json],
+        params: Json,
+        key: str,
+        flag: shared_memory.SharedMemory,
+    ) -> Json:
+        """Run one shared job in the pool and store its result."""
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.pool, job, params)
+        finally:
+            current = self._inflight.get(key)
+            if current is not None and current.flag is flag:
+                del self._inflight[key]
+            flag.close()
+            flag.unlink()
+
+        if self.cache_size:
+            self._lru[key] = result
+            if len(self._lru) > self.cache_size:
+                self._lru.popitem(last=False)
+        return result
+
+    async def generate(self, payload: Json) -> Json:
+        """Handle one generate request."""
+        params = _generate_params(payload, self.memory_budget)
+        if params["seed"] is None:
+            return await self._run(generate_job, params, None)
+
+        # The timeout does not change the maze: the shared job runs
+        # without one, each caller waits up to its own and the job is
+        # cancelled once nobody waits.
+        timeout = params["timeout"]
+        shared = dict(params, timeout=None)
+        key = "generate:" + json.dumps(shared, sort_keys=True)
+        return await self._run(generate_job, shared, key, timeout)
+
+    async def solve(self, payload: Json) -> Json:
+        """Handle one solve request."""
+        params = _solve_params(payload)
+        key = "solve:" + json.dumps(params, sort_keys=True)
+        return await self._run(solve_job, params, key)
+
+    async def dispatch(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+    ) -> Tuple[int, Json]:
+        """Route one request and return (status, JSON body)."""
+        if method == "GET" and path == "/stats":
+            return 200, self.stats.snapshot()
+
+        handlers = {"/generate": self.generate, "/solve": self.solve}
+        if path not in handlers:
+            return 404, {"error": f"Unknown path '{path}'."}
+        if method != "POST":
+            return 405, {"error": "Use POST."}
+
+        self.stats.requests += 1
+        started = time.perf_counter()
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise RequestError("Request body must be a JSON object.")
+            result = await handlers[path](payload)
+        except (RequestError, ValueError) as exc:
+            self.stats.record(time.perf_counter() - started, ok=False)
+            return 400, {"error": str(exc)}
+        except DeadlineExceeded as exc:
+            self.stats.record(time.perf_counter() - started, ok=False)
+            return 504, {"error": str(exc)}
+        except Exception as exc:
+            self.stats.record(time.perf_counter() - started, ok=False)
+            return 500, {"error": str(exc)}
+
+        self.stats.record(time.perf_counter() - started, ok=True)
+        return 200, result
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Serve one HTTP request, then close the connection."""
+        try:
+            request_line = await reader.readline()
+            parts = request_line.decode("latin-1").split()
+            if len(parts) < 2:
+                return
+
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value.strip())
+
+            if length > MAX_BODY_BYTES:
+                status, body = 413, {"error": "Request body too large."}
+            else:
+                data = await reader.readexactly(length) if length else b""
+                status, body = await self.dispatch(parts[0], parts[1], data)
+
+            payload = json.dumps(body).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+                + payload
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    504: "Gateway Timeout",
+}
+
+
+def _check_loopback(host: str) -> None:
+    """Refuse to listen anywhere but on the local machine."""
+    if host == "localhost":
+        return
+    try:
+        if ipaddress.ip_address(host).is_loopback:
+            return
+    except ValueError:
+        pass
+    raise ValueError(f"Refusing to listen on non-loopback host '{host}'.")
+
+
+async def serve(
+    service: MazeService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+) -> None:
+    """Listen on a loopback port or a Unix socket until cancelled."""
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(
+            service.handle_connection,
+            path=unix_path,
+        )
+    else:
+        _check_loopback(host)
+        server = await asyncio.start_server(
+            service.handle_connection,
+            host=host,
+            port=port,
+        )
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Parse the command line and run the service."""
+    parser = argparse.ArgumentParser(description="Local maze service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=128)
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+    )
+    args = parser.parse_args()
+
+    service = MazeService(
+        workers=args.workers,
+        cache_size=args.cache_size,
+        memory_budget=args.memory_budget_mb * 1024 * 1024,
+    )
+    try:
+        asyncio.run(
+            serve(service, args.host, args.port, args.unix_path)
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
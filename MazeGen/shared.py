@@ -0,0 +1,164 @@
+"""Shared-memory transport for mazes generated in worker processes.
+
+A worker carves straight into a ``multiprocessing.shared_memory`` block
+and returns only a small :class:`SharedMazeHandle`; the parent then wraps
+the same block as a :class:`MazeGrid` without copying or unpickling any
+cells.
+
+Block layout: ``width * height`` cell bytes followed by a PackedBitmap of
+the blocked mask.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+from .generator import MazeGenerator
+from .grid import MazeGrid
+from .storage import PackedBitmap
+
+Coord = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class SharedMazeHandle:
+    """Picklable description of a maze stored in shared memory."""
+
+    name: str
+    width: int
+    height: int
+    entry: Coord
+    exit: Coord
+    solution: Optional[str] = None
+
+
+class SharedMazeBlock:
+    """Own or attach to the shared memory block of one maze."""
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        width: int,
+        height: int,
+    ) -> None:
+        """Wrap an open shared memory block."""
+        if shm.size < self.nbytes(width, height):
+            raise ValueError("Shared memory block is too small.")
+        self._shm = shm
+        self.width = width
+        self.height = height
+        self._grid: Optional[MazeGrid] = None
+        self._blocked: Optional[PackedBitmap] = None
+
+    @staticmethod
+    def nbytes(width: int, height: int) -> int:
+        """Return the block size needed for one maze."""
+        return width * height + PackedBitmap.nbytes(width, height)
+
+    @classmethod
+    def create(cls, width: int, height: int) -> "SharedMazeBlock":
+        """Allocate a new block sized for a width x height maze."""
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive.")
+        shm = shared_memory.SharedMemory(
+            create=True,
+            size=cls.nbytes(width, height),
+        )
+        return cls(shm, width, height)
+
+    @classmethod
+    def attach(cls, handle: SharedMazeHandle) -> "SharedMazeBlock":
+        """Open the block described by a handle."""
+        shm = shared_memory.SharedMemory(name=handle.name)
+        return cls(shm, handle.width, handle.height)
+
+    @property
+    def name(self) -> str:
+        """Return the system-wide block name."""
+        return self._shm.name
+
+    def handle(self, entry: Coord, exit_: Coord) -> SharedMazeHandle:
+        """Return a handle a worker can use to fill this block."""
+        return SharedMazeHandle(
+            self.name, self.width, self.height, entry, exit_
+        )
+
+    def _buffer(self) -> memoryview:
+        """Return the raw block bytes."""
+        buf = self._shm.buf
+        if buf is None:
+            raise RuntimeError("Shared memory block is closed.")
+        return buf
+
+    @property
+    def grid(self) -> MazeGrid:
+        """Return the cells as a MazeGrid over the shared block."""
+        if self._grid is None:
+            size = self.width * self.height
+            self._grid = MazeGrid(
+                self.width,
+                self.height,
+                buffer=self._buffer()[:size],
+                clear=False,
+            )
+        return self._grid
+
+    @property
+    def blocked(self) -> PackedBitmap:
+        """Return the blocked mask over the shared block."""
+        if self._blocked is None:
+            size = self.width * self.height
+            self._blocked = PackedBitmap(
+                self.width,
+                self.height,
+                buffer=self._buffer()[size:],
+            )
+        return self._blocked
+
+    def close(self) -> None:
+        """Drop every view and detach from the block."""
+        if self._grid is not None:
+            self._grid.release()
+            self._grid = None
+        if self._blocked is not None:
+            self._blocked.release()
+            self._blocked = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the block; call once, from the owning process."""
+        self._shm.unlink()
+
+
+def generate_into(
+    handle: SharedMazeHandle,
+    perfect: bool,
+    seed: Optional[int] = None,
+    algorithm: str = "dfs",
+    margin: int = 1,
+) -> SharedMazeHandle:
+    """Generate a maze into shared memory and return its handle.
+
+    Meant to run in a worker process.  Only the handle, with the solution
+    filled in, travels back to the caller.
+    """
+    block = SharedMazeBlock.attach(handle)
+    try:
+        generator = MazeGenerator(
+            handle.width,
+            handle.height,
+            handle.entry,
+            handle.exit,
+            handle.name,
+            perfect,
+            seed=seed,
+            algorithm=algorithm,
+            storage=(block.grid, block.blocked),
+        )
+        generator.generate(margin=margin)
+        solution = generator.solve()
+    finally:
+        block.close()
+    return replace(handle, solution=solution)
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import mmap
 from collections import deque
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from .constants import DIRS
+from .limits import RunControl
+from .storage import CellRows, FlagRows
 
-Grid = List[List[int]]
+Grid = CellRows
 Coord = Tuple[int, int]
+Scratch = Union[bytearray, memoryview, mmap.mmap]
+
+# Marks the entry cell in the move buffer; 1..4 index DIRS.
+_START = 255
 
 DIR_LETTERS: Dict[Tuple[int, int], str] = {
     (0, -1): "N",
@@ -26,9 +33,17 @@ class MazeSolver:
         grid: Grid,
         entry: Coord,
         exit_: Coord,
-        blocked: Optional[List[List[bool]]] = None,
+        blocked: Optional[FlagRows] = None,
+        scratch: Optional[Scratch] = None,
+        control: Optional[RunControl] = None,
     ) -> None:
-        """Store maze data and validate dimensions."""
+        """Store maze data and validate dimensions.
+
+        The search records one move byte per cell.  ``scratch`` may supply
+        that buffer (for example a mapped file for out-of-core mazes);
+        otherwise a private bytearray is allocated on each solve.  A
+        ``control`` is checked every ``control.interval`` expanded cells.
+        """
         if not grid or not grid[0]:
             raise ValueError("Grid cannot be empty.")
 
@@ -42,6 +57,14 @@ class MazeSolver:
         self.entry = entry
         self.exit = exit_
         self.blocked = blocked
+        self.scratch = scratch
+        self.control = control
+
+        if (
+            scratch is not None
+            and len(memoryview(scratch)) < self.width * self.height
+        ):
+            raise ValueError("Scratch buffer is smaller than the grid.")
 
         sx, sy = entry
         ex, ey = exit_
@@ -69,55 +92,71 @@ class MazeSolver:
         """Return True if a wall bit is open."""
         return (self.grid[y][x] & (1 << bit)) == 0
 
+    def _moves(self) -> memoryview:
+        """Return a zeroed move buffer with one byte per cell."""
+        size = self.width * self.height
+        if self.scratch is None:
+            return memoryview(bytearray(size))
+
+        moves = memoryview(self.scratch).cast("B")[:size]
+        zero = bytes(self.width)
+        for y in range(self.height):
+            moves[y * self.width:(y + 1) * self.width] = zero
+        return moves
+
     def solve(self) -> Optional[str]:
         """Return the shortest path as N/E/S/W letters."""
         if self.entry == self.exit:
             return ""
 
+        width = self.width
+        moves = self._moves()
+        sx, sy = self.entry
+        moves[sy * width + sx] = _START
+
         queue = deque([self.entry])
-        came_from: Dict[Coord, Coord] = {}
-        move_taken: Dict[Coord, str] = {}
-        visited = {self.entry}
+        control = self.control
+        total = self.width * self.height
+        expanded = 0
 
         while queue:
             x, y = queue.popleft()
+            expanded += 1
+            if control is not None and expanded % control.interval == 0:
+                control.update("solve", expanded, total)
 
             if (x, y) == self.exit:
-                return self._reconstruct(came_from, move_taken)
+                return self._reconstruct(moves)
 
-            for dx, dy, b_curr, _b_next in DIRS:
+            for code, (dx, dy, b_curr, _b_next) in enumerate(DIRS, 1):
                 nx, ny = x + dx, y + dy
 
                 if not self._in_bounds(nx, ny):
                     continue
                 if self.blocked is not None and self.blocked[ny][nx]:
                     continue
-                if (nx, ny) in visited:
+                if moves[ny * width + nx]:
                     continue
                 if not self._wall_open(x, y, b_curr):
                     continue
 
-                visited.add((nx, ny))
-                came_from[(nx, ny)] = (x, y)
-                move_taken[(nx, ny)] = DIR_LETTERS[(dx, dy)]
+                moves[ny * width + nx] = code
                 queue.append((nx, ny))
 
         return None
 
-    def _reconstruct(
-        self,
-        came_from: Dict[Coord, Coord],
-        move_taken: Dict[Coord, str],
-    ) -> str:
-        """Build the final path string."""
-        cur = self.exit
+    def _reconstruct(self, moves: memoryview) -> str:
+        """Build the final path string by walking moves back."""
+        x, y = self.exit
         letters: List[str] = []
 
-        while cur != self.entry:
-            if cur not in came_from:
+        while (x, y) != self.entry:
+            code = moves[y * self.width + x]
+            if code == 0 or code == _START:
                 return ""
-            letters.append(move_taken[cur])
-            cur = came_from[cur]
+            dx, dy, _b_curr, _b_next = DIRS[code - 1]
+            letters.append(DIR_LETTERS[(dx, dy)])
+            x, y = x - dx, y - dy
 
         letters.reverse()
         return "".join(letters)
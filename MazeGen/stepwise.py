@@ -0,0 +1,83 @@
+"""Drive step-wise generation in bounded slices."""
+
+from __future__ import annotations
+
+import time
+from typing import Iterator, Optional, Set, Tuple
+
+Coord = Tuple[int, int]
+
+# Cells changed by one step; None means the whole grid may have changed.
+Changes = Optional[Tuple[Coord, ...]]
+
+
+class StepRunner:
+    """Advance a step iterator for a number of steps or milliseconds.
+
+    The cells changed since the last ``take_changes()`` accumulate between
+    calls, so a renderer can redraw only those.
+    """
+
+    def __init__(self, steps: Iterator[Changes]) -> None:
+        """Wrap an iterator produced by a step-wise API."""
+        self._steps = steps
+        self._changed: Set[Coord] = set()
+        self._full = False
+        self.done = False
+        self.steps_taken = 0
+
+    def advance(
+        self,
+        max_steps: Optional[int] = None,
+        budget_ms: Optional[float] = None,
+    ) -> bool:
+        """Run until a limit is reached or the work ends; return done."""
+        if self.done:
+            return True
+        if max_steps is None and budget_ms is None:
+            raise ValueError("Give max_steps, budget_ms or both.")
+
+        deadline = (
+            None
+            if budget_ms is None
+            else time.perf_counter() + budget_ms / 1000
+        )
+        taken = 0
+        for changed in self._steps:
+            self.steps_taken += 1
+            taken += 1
+            if changed is None:
+                self._full = True
+            elif not self._full:
+                self._changed.update(changed)
+            if max_steps is not None and taken >= max_steps:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+
+        self.done = True
+        return True
+
+    def run(self) -> None:
+        """Run every remaining step."""
+        for _changed in self._steps:
+            self.steps_taken += 1
+        self._full = True
+        self.done = True
+
+    def take_changes(self) -> Optional[Set[Coord]]:
+        """Return and forget the changed cells; None means redraw all."""
+        if self._full:
+            self._full = False
+            self._changed = set()
+            return None
+        changed = self._changed
+        self._changed = set()
+        return changed
+
+    def close(self) -> None:
+        """Abandon the remaining steps."""
+        close = getattr(self._steps, "close", None)
+        if close is not None:
+            close()
+        self.done = True
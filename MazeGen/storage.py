@@ -0,0 +1,412 @@
+"""Storage backends for maze cells and boolean cell masks.
+
+The pipeline only relies on ``rows[y][x]`` reads and writes, so a grid
+or mask may be plain nested lists, memoryview rows over a flat byte
+buffer, or rows of a bit-packed bitmap living in a memory-mapped file.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+BACKENDS = ("memory", "mmap")
+
+
+class CellRow(Protocol):
+    """One row of wall values indexed by x."""
+
+    def __getitem__(self, index: int, /) -> int:
+        """Return the wall value of one cell."""
+
+    def __setitem__(self, index: int, value: int, /) -> None:
+        """Store the wall value of one cell."""
+
+    def __len__(self) -> int:
+        """Return the row width."""
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the wall values."""
+
+
+class FlagRow(Protocol):
+    """One row of boolean cell flags indexed by x."""
+
+    def __getitem__(self, index: int, /) -> bool:
+        """Return the flag of one cell."""
+
+    def __setitem__(self, index: int, value: bool, /) -> None:
+        """Store the flag of one cell."""
+
+    def __len__(self) -> int:
+        """Return the row width."""
+
+    def __iter__(self) -> Iterator[bool]:
+        """Iterate over the flags."""
+
+
+class CoordStack(Protocol):
+    """LIFO stack of (x, y) cells, such as a plain list of tuples."""
+
+    def append(self, item: Tuple[int, int], /) -> None:
+        """Push one cell."""
+
+    def pop(self) -> Tuple[int, int]:
+        """Remove and return the top cell."""
+
+    def __getitem__(self, index: int, /) -> Tuple[int, int]:
+        """Return one cell; ``-1`` is the top."""
+
+    def __len__(self) -> int:
+        """Return the stack depth."""
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Iterate from the bottom to the top."""
+
+
+CellRows = Sequence[CellRow]
+FlagRows = Sequence[FlagRow]
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def map_file(path: str, size: int) -> mmap.mmap:
+    """Create or resize a file to ``size`` bytes and map it read-write."""
+    if size <= 0:
+        raise ValueError("Mapped size must be positive.")
+    with open(path, "a+b") as file:
+        file.truncate(size)
+        return mmap.mmap(file.fileno(), size)
+
+
+class BitRow:
+    """View one row of a PackedBitmap as booleans."""
+
+    __slots__ = ("_buf", "_base", "_width")
+
+    def __init__(self, buf: memoryview, base: int, width: int) -> None:
+        """Store the shared buffer and the row position."""
+        self._buf = buf
+        self._base = base
+        self._width = width
+
+    def __len__(self) -> int:
+        """Return the row width."""
+        return self._width
+
+    def __getitem__(self, index: int) -> bool:
+        """Return one bit as a boolean."""
+        if not 0 <= index < self._width:
+            raise IndexError("bitmap column out of range")
+        return bool(self._buf[self._base + (index >> 3)] >> (index & 7) & 1)
+
+    def __setitem__(self, index: int, value: bool) -> None:
+        """Set or clear one bit."""
+        if not 0 <= index < self._width:
+            raise IndexError("bitmap column out of range")
+        pos = self._base + (index >> 3)
+        if value:
+            self._buf[pos] |= 1 << (index & 7)
+        else:
+            self._buf[pos] &= ~(1 << (index & 7)) & 0xFF
+
+    def __iter__(self) -> Iterator[bool]:
+        """Iterate over the row bits."""
+        buf = self._buf
+        base = self._base
+        for x in range(self._width):
+            yield bool(buf[base + (x >> 3)] >> (x & 7) & 1)
+
+
+class PackedBitmap(Sequence[BitRow]):
+    """Boolean mask with one bit per cell, indexable as ``mask[y][x]``.
+
+    Every row starts on a byte boundary, so a row is ``ceil(width / 8)``
+    bytes.  The bits live in any writable buffer: a private bytearray, a
+    memory-mapped file or a shared memory block.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        buffer: Optional[Union[bytearray, memoryview, mmap.mmap]] = None,
+    ) -> None:
+        """Wrap a buffer, or allocate a cleared one."""
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive.")
+        self.width = width
+        self.height = height
+        self.row_bytes = (width + 7) // 8
+        size = self.row_bytes * height
+
+        if buffer is None:
+            buffer = bytearray(size)
+        view = memoryview(buffer).cast("B")
+        if len(view) < size:
+            raise ValueError("Buffer is too small for the bitmap.")
+        self._buf = view[:size]
+        self._rows = [
+            BitRow(self._buf, y * self.row_bytes, width)
+            for y in range(height)
+        ]
+
+    @classmethod
+    def nbytes(cls, width: int, height: int) -> int:
+        """Return the buffer size needed for one bitmap."""
+        return ((width + 7) // 8) * height
+
+    @classmethod
+    def mapped(cls, width: int, height: int, path: str) -> "PackedBitmap":
+        """Create a cleared bitmap backed by a memory-mapped file."""
+        bitmap = cls(width, height, map_file(path, cls.nbytes(width, height)))
+        bitmap.clear()
+        return bitmap
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self.height
+
+    @overload
+    def __getitem__(self, index: int) -> BitRow:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[BitRow]:
+        ...
+
+    def __getitem__(
+        self,
+        index: Union[int, slice],
+    ) -> Union[BitRow, List[BitRow]]:
+        """Return one row view, or a list of row views."""
+        return self._rows[index]
+
+    def __iter__(self) -> Iterator[BitRow]:
+        """Iterate over the row views."""
+        return iter(self._rows)
+
+    @property
+    def buffer(self) -> memoryview:
+        """Return the packed bytes."""
+        return self._buf
+
+    def clear(self) -> None:
+        """Clear every bit, one row at a time."""
+        zero = bytes(self.row_bytes)
+        for y in range(self.height):
+            base = y * self.row_bytes
+            self._buf[base:base + self.row_bytes] = zero
+
+    def load(self, rows: FlagRows) -> None:
+        """Copy the flags of another mask into this bitmap."""
+        for y, row in enumerate(rows):
+            target = self._rows[y]
+            for x, flag in enumerate(row):
+                if flag:
+                    target[x] = True
+
+    def release(self) -> None:
+        """Drop the buffer views so the owner can be closed."""
+        self._rows = []
+        self._buf.release()
+
+
+class MappedStack(Sequence[Tuple[int, int]]):
+    """Stack of (x, y) cells stored as flat 64-bit indices in a buffer.
+
+    A DFS can hold every free cell at once, so the buffer has one slot per
+    cell.  Backed by a mapped file, the stack costs 8 bytes per cell of
+    disk instead of a Python tuple per entry in RAM.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        buffer: Optional[Union[bytearray, mmap.mmap]] = None,
+    ) -> None:
+        """Wrap a buffer of ``width * height`` slots, or allocate one."""
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive.")
+        self.width = width
+        size = self.nbytes(width, height)
+        if buffer is None:
+            buffer = bytearray(size)
+        view = memoryview(buffer).cast("B")
+        if len(view) < size:
+            raise ValueError("Buffer is too small for the stack.")
+        self._raw = view[:size]
+        self._slots = self._raw.cast("q")
+        self._len = 0
+
+    @classmethod
+    def nbytes(cls, width: int, height: int) -> int:
+        """Return the buffer size needed for one stack."""
+        return width * height * 8
+
+    @classmethod
+    def mapped(cls, width: int, height: int, path: str) -> "MappedStack":
+        """Create an empty stack backed by a memory-mapped file."""
+        return cls(width, height, map_file(path, cls.nbytes(width, height)))
+
+    def append(self, item: Tuple[int, int]) -> None:
+        """Push one cell."""
+        if self._len == len(self._slots):
+            raise IndexError("stack is full")
+        self._slots[self._len] = item[1] * self.width + item[0]
+        self._len += 1
+
+    def pop(self) -> Tuple[int, int]:
+        """Remove and return the top cell."""
+        if not self._len:
+            raise IndexError("pop from empty stack")
+        self._len -= 1
+        y, x = divmod(self._slots[self._len], self.width)
+        return x, y
+
+    def clear(self) -> None:
+        """Empty the stack; the slots are simply reused."""
+        self._len = 0
+
+    @property
+    def buffer(self) -> memoryview:
+        """Return the stacked entries as native 64-bit flat indices."""
+        return self._raw[:self._len * 8]
+
+    def load(self, data: BytesLike) -> None:
+        """Replace the contents with native 64-bit flat indices."""
+        raw = memoryview(data).cast("B")
+        if len(raw) % 8 or len(raw) > len(self._raw):
+            raise ValueError("Stack data does not fit this stack.")
+        self._raw[:len(raw)] = raw
+        self._len = len(raw) // 8
+
+    def __len__(self) -> int:
+        """Return the stack depth."""
+        return self._len
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Tuple[int, int]]:
+        ...
+
+    def __getitem__(
+        self,
+        index: Union[int, slice],
+    ) -> Union[Tuple[int, int], List[Tuple[int, int]]]:
+        """Return one cell, or a list of cells."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("stack index out of range")
+        y, x = divmod(self._slots[index], self.width)
+        return x, y
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Iterate from the bottom to the top."""
+        for index in range(self._len):
+            y, x = divmod(self._slots[index], self.width)
+            yield x, y
+
+    def release(self) -> None:
+        """Drop the buffer views so the owner can be closed."""
+        self._len = 0
+        self._slots.release()
+        self._raw.release()
+
+
+def new_flags(
+    width: int,
+    height: int,
+    directory: Optional[str] = None,
+    name: str = "",
+) -> FlagRows:
+    """Return a cleared mask, mapped to ``directory/name`` if given."""
+    if directory is None:
+        return [[False] * width for _ in range(height)]
+    return PackedBitmap.mapped(width, height, os.path.join(directory, name))
+
+
+def clear_flags(rows: FlagRows) -> None:
+    """Clear every flag of a mask in place."""
+    if isinstance(rows, PackedBitmap):
+        rows.clear()
+        return
+    for row in rows:
+        if isinstance(row, list):
+            row[:] = [False] * len(row)
+            continue
+        for x in range(len(row)):
+            row[x] = False
+
+
+def count_flags(rows: FlagRows) -> int:
+    """Return how many flags of a mask are set."""
+    if isinstance(rows, PackedBitmap):
+        buf = rows.buffer
+        step = 1 << 16
+        return sum(
+            int.from_bytes(buf[pos:pos + step], "little").bit_count()
+            for pos in range(0, len(buf), step)
+        )
+    return sum(1 for row in rows for flag in row if flag)
+
+
+def pack_flags(rows: FlagRows) -> bytes:
+    """Return a mask as PackedBitmap bytes."""
+    if isinstance(rows, PackedBitmap):
+        return rows.buffer.tobytes()
+    bitmap = PackedBitmap(len(rows[0]), len(rows))
+    bitmap.load(rows)
+    return bitmap.buffer.tobytes()
+
+
+def unpack_flags(rows: FlagRows, data: BytesLike) -> None:
+    """Overwrite a mask in place from PackedBitmap bytes."""
+    if isinstance(rows, PackedBitmap):
+        rows.buffer[:] = data
+        return
+    bitmap = PackedBitmap(len(rows[0]), len(rows), bytearray(data))
+    for target, row in zip(rows, bitmap):
+        for x, flag in enumerate(row):
+            target[x] = flag
+
+
+def write_atomic(path: str, parts: Iterable[BytesLike]) -> None:
+    """Write a file so readers see either the old or the new content.
+
+    The data goes to a temporary file in the same directory, is synced,
+    and then replaces ``path`` in one ``os.replace``.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            for part in parts:
+                file.write(part)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
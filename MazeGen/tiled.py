@@ -0,0 +1,233 @@
+"""Tiled, multi-process DFS carving for very large mazes."""
+
+from __future__ import annotations
+
+import random
+from array import array
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .carver_dfs import DFSMazeCarver
+from .constants import DIRS
+from .grid import MazeGrid
+from .limits import RunControl
+from .storage import FlagRows
+
+# (tile_width, tile_height, tile_blocked_rows, seed)
+TileTask = Tuple[int, int, List[List[bool]], int]
+# (cell bytes, component labels or None when the tile has one region)
+TileResult = Tuple[bytes, Optional[bytes]]
+Region = Tuple[int, int]
+
+
+def _label_regions(grid: MazeGrid, blocked: FlagRows) -> bytes:
+    """Return one component label per cell, following open walls."""
+    labels = array("i", [-1]) * (grid.width * grid.height)
+    current = 0
+
+    for y in range(grid.height):
+        for x in range(grid.width):
+            if blocked[y][x] or labels[y * grid.width + x] != -1:
+                continue
+
+            labels[y * grid.width + x] = current
+            queue = deque([(x, y)])
+            while queue:
+                cx, cy = queue.popleft()
+                cell = grid.cells[cy][cx]
+                for dx, dy, b_curr, _b_next in DIRS:
+                    if cell & (1 << b_curr):
+                        continue
+                    nx, ny = cx + dx, cy + dy
+                    if labels[ny * grid.width + nx] == -1:
+                        labels[ny * grid.width + nx] = current
+                        queue.append((nx, ny))
+            current += 1
+
+    return labels.tobytes()
+
+
+def carve_tile(task: TileTask) -> TileResult:
+    """Carve every free region of one tile with its own seeded DFS."""
+    width, height, blocked, seed = task
+    grid = MazeGrid(width, height)
+    carver = DFSMazeCarver(random.Random(seed))
+    visited = [[False for _ in range(width)] for _ in range(height)]
+    regions = 0
+
+    for y in range(height):
+        for x in range(width):
+            if blocked[y][x] or visited[y][x]:
+                continue
+            carver.carve(grid, x, y, blocked, visited)
+            regions += 1
+
+    cells = b"".join(bytes(row) for row in grid.cells)
+    if regions <= 1:
+        return cells, None
+    return cells, _label_regions(grid, blocked)
+
+
+class TiledCarver:
+    """Carve independent tiles in parallel and join them into one tree.
+
+    Each tile is carved in a worker process with a seed drawn from the
+    master generator, so the result only depends on the seed and the tile
+    size, never on the number of workers.  Tiles are then joined by opening
+    exactly one wall per edge of a random spanning tree over the tile
+    regions, which keeps the maze perfect.
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        tile_size: int,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Store the random generator and the tiling settings."""
+        if not isinstance(tile_size, int) or tile_size < 2:
+            raise ValueError("tile_size must be an integer >= 2.")
+        if workers is not None and (
+            not isinstance(workers, int) or workers < 1
+        ):
+            raise ValueError("workers must be a positive integer.")
+        self.rng = rng
+        self.tile_size = tile_size
+        self.workers = workers
+
+    def _tiles(self, grid: MazeGrid) -> List[Tuple[int, int, int, int]]:
+        """Return (x0, y0, width, height) for every tile, row-major."""
+        size = self.tile_size
+        return [
+            (x0, y0, min(size, grid.width - x0), min(size, grid.height - y0))
+            for y0 in range(0, grid.height, size)
+            for x0 in range(0, grid.width, size)
+        ]
+
+    def _run(
+        self,
+        tasks: List[TileTask],
+        control: Optional[RunControl] = None,
+    ) -> Iterable[TileResult]:
+        """Carve all tiles, in worker processes when useful.
+
+        A ``control`` is checked after every tile; a stopped run cancels
+        the tiles that have not started.
+        """
+        results: List[TileResult] = []
+        if self.workers == 1 or len(tasks) == 1:
+            for task in tasks:
+                if control is not None:
+                    control.check()
+                results.append(carve_tile(task))
+            return results
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            for result in pool.map(carve_tile, tasks, chunksize=4):
+                if control is not None:
+                    control.check()
+                results.append(result)
+        finally:
+            pool.shutdown(cancel_futures=True)
+        return results
+
+    def carve(
+        self,
+        grid: MazeGrid,
+        start_x: int,
+        start_y: int,
+        blocked: FlagRows,
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Carve every free cell; the start cell does not matter here.
+
+        A ``control`` is checked while tiles are prepared, carved and
+        joined.
+        """
+        tiles = self._tiles(grid)
+        tasks: List[TileTask] = []
+        for x0, y0, tw, th in tiles:
+            if control is not None:
+                control.check()
+            tasks.append((
+                tw,
+                th,
+                [
+                    [row[x] for x in range(x0, x0 + tw)]
+                    for row in blocked[y0:y0 + th]
+                ],
+                self.rng.getrandbits(64),
+            ))
+
+        tile_labels: List[Optional[memoryview]] = []
+        results = self._run(tasks, control)
+        for (x0, y0, tw, th), (cells, labels) in zip(tiles, results):
+            for dy in range(th):
+                grid.write_row(y0 + dy, x0, cells[dy * tw:(dy + 1) * tw])
+            tile_labels.append(
+                memoryview(labels).cast("i") if labels is not None else None
+            )
+
+        tiles_per_row = -(-grid.width // self.tile_size)
+
+        def region(x: int, y: int) -> Region:
+            """Return the (tile, component) node owning one cell."""
+            tile = (
+                (y // self.tile_size) * tiles_per_row
+                + (x // self.tile_size)
+            )
+            labels = tile_labels[tile]
+            if labels is None:
+                return tile, 0
+            x0, y0, tw, _th = tiles[tile]
+            return tile, labels[(y - y0) * tw + (x - x0)]
+
+        self._join(grid, blocked, region, control)
+
+    def _join(
+        self,
+        grid: MazeGrid,
+        blocked: FlagRows,
+        region: Callable[[int, int], Region],
+        control: Optional[RunControl] = None,
+    ) -> None:
+        """Open one boundary wall per edge of a random spanning tree."""
+        size = self.tile_size
+        candidates: List[Tuple[int, int, int, int, int, int]] = []
+
+        for x in range(size - 1, grid.width - 1, size):
+            for y in range(grid.height):
+                if not blocked[y][x] and not blocked[y][x + 1]:
+                    candidates.append((x, y, x + 1, y, 1, 3))
+        for y in range(size - 1, grid.height - 1, size):
+            for x in range(grid.width):
+                if not blocked[y][x] and not blocked[y + 1][x]:
+                    candidates.append((x, y, x, y + 1, 2, 0))
+
+        self.rng.shuffle(candidates)
+
+        parent: Dict[Region, Region] = {}
+
+        def find(node: Region) -> Region:
+            """Return the union-find representative of one region."""
+            root = node
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while node != root:
+                following = parent[node]
+                parent[node] = root
+                node = following
+            return root
+
+        for step, (x, y, nx, ny, b_curr, b_next) in enumerate(candidates):
+            if control is not None and step % control.interval == 0:
+                control.check()
+            ra = find(region(x, y))
+            rb = find(region(nx, ny))
+            if ra == rb:
+                continue
+            parent[ra] = rb
+            grid.break_wall(x, y, nx, ny, b_curr, b_next)
@@ -0,0 +1,50 @@
+"""Compare batched generation with one MazeGenerator per maze.
+
+Usage: python3 benchmarks/bench_batch.py [count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MazeGen.batch import generate_batch  # noqa: E402
+from MazeGen.generator import MazeGenerator  # noqa: E402
+
+WIDTH, HEIGHT = 30, 20
+ENTRY, EXIT = (0, 0), (WIDTH - 1, HEIGHT - 1)
+
+
+def per_maze(count: int) -> float:
+    """Return microseconds per maze with one generator call per maze."""
+    start = time.perf_counter()
+    for seed in range(count):
+        generator = MazeGenerator(
+            WIDTH, HEIGHT, ENTRY, EXIT, "bench.txt", True,
+            seed=seed, algorithm="sidewinder",
+        )
+        generator.generate()
+        generator.build_output_text()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def batched(count: int) -> float:
+    """Return microseconds per maze for one batch, output text included."""
+    start = time.perf_counter()
+    batch = generate_batch(WIDTH, HEIGHT, ENTRY, EXIT, count, seed=1)
+    for k in range(len(batch)):
+        batch.build_output_text(k)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    """Print the cost per maze of both approaches."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"{WIDTH}x{HEIGHT} sidewinder mazes, {count} in the batch")
+    print(f"{'per maze':<10} {per_maze(min(count, 500)):8.0f} us/maze")
+    print(f"{'batched':<10} {batched(count):8.0f} us/maze")
+
+
+if __name__ == "__main__":
+    main()
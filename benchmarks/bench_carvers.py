@@ -0,0 +1,57 @@
+"""Compare time and peak memory of the carving algorithms.
+
+Usage: python3 benchmarks/bench_carvers.py [size ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MazeGen.generator import CARVERS, MazeGenerator  # noqa: E402
+
+ALGORITHMS = ("dfs", "dfs_lean")
+
+
+def measure(algorithm: str, size: int) -> Tuple[float, int]:
+    """Return (carve time in ms, peak traced bytes) for one maze."""
+    generator = MazeGenerator(
+        size, size, (0, 0), (size - 1, size - 1), "bench.txt", True,
+        seed=1, algorithm=algorithm,
+    )
+    generator.generate()
+    blocked = generator.blocked
+    carver = CARVERS[algorithm](generator.rng)
+
+    generator.grid.reset()
+    start = time.perf_counter()
+    carver.carve(generator.grid, 0, 0, blocked)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    carver = CARVERS[algorithm](generator.rng)
+    generator.grid.reset()
+    tracemalloc.start()
+    carver.carve(generator.grid, 0, 0, blocked)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    """Print carve time and peak memory per algorithm and size."""
+    sizes: List[int] = [int(arg) for arg in sys.argv[1:]] or [100, 300, 600]
+    print(f"{'size':>6} {'algorithm':<10} {'time':>11} {'peak memory':>12}")
+    for size in sizes:
+        for algorithm in ALGORITHMS:
+            elapsed, peak = measure(algorithm, size)
+            print(
+                f"{size:>6} {algorithm:<10} {elapsed:8.1f} ms "
+                f"{peak / 1024:9.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
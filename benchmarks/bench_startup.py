@@ -0,0 +1,77 @@
+"""Measure start-up time of the headless and GUI entry points.
+
+Usage: python3 benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIG = """WIDTH=20
+HEIGHT=15
+ENTRY=0,0
+EXIT=19,14
+OUTPUT_FILE={output}
+PERFECT=True
+SEED=42
+"""
+
+
+def time_command(command: List[str], runs: int) -> Optional[float]:
+    """Return the median wall time in ms, or None if the command fails."""
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            command,
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            return None
+        samples.append(elapsed)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    """Run every start-up scenario and print a table."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    python = sys.executable
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = os.path.join(tmp, "config.txt")
+        with open(config_path, "w", encoding="utf-8") as file:
+            file.write(CONFIG.format(output=os.path.join(tmp, "maze.txt")))
+
+        scenarios = [
+            ("interpreter only", [python, "-c", "pass"]),
+            ("import MazeGen", [python, "-c", "import MazeGen"]),
+            ("a_maze_ing.py --no-gui", [
+                python, "a_maze_ing.py", "--no-gui", config_path,
+            ]),
+            ("python -m MazeGen generate", [
+                python, "-m", "MazeGen", "generate", config_path,
+            ]),
+            ("python -m MazeGen validate", [
+                python, "-m", "MazeGen", "validate", config_path,
+            ]),
+            ("GUI import (src + mlx)", [python, "-c", "import src"]),
+        ]
+
+        print(f"Start-up time, median of {runs} runs")
+        for label, command in scenarios:
+            median = time_command(command, runs)
+            shown = "unavailable" if median is None else f"{median:8.1f} ms"
+            print(f"  {label:<28} {shown}")
+
+
+if __name__ == "__main__":
+    main()
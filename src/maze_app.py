@@ -1,22 +1,45 @@
 import random
-from typing import Any, Dict, List, Tuple
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from mlx import Mlx
 
 from MazeGen import MazeGenerator
+from MazeGen.config import build_generator
+from MazeGen.profiling import ActionProfiler
+from MazeGen.stepwise import StepRunner
 
 
 class MazeApp:
     """Manage the graphical window, rendering, and keyboard events."""
 
+    # Time spent generating per frame, so the window stays responsive.
+    FRAME_BUDGET_MS: float = 8.0
+
+    # Semantic roles stored in the index buffer, one byte per pixel.
+    ROLE_BG: int = 0
+    ROLE_BORDER: int = 1
+    ROLE_PATH: int = 2
+    ROLE_ENTRY: int = 3
+    ROLE_EXIT: int = 4
+    ROLE_UI: int = 5
+
+    ENTRY_COLOR: int = 0x00FF00
+    EXIT_COLOR: int = 0xFF0000
+
     def __init__(
         self,
         width: int,
         height: int,
         title: str,
         config: Dict[str, Any],
+        profile_dir: Optional[str] = None,
     ) -> None:
-        """Initialize the window and the maze generator."""
+        """Initialize the window and the maze generator.
+
+        With ``profile_dir``, the first generation and every REGEN, PATH
+        and COLOR action are profiled into pstats files there.
+        """
         self.width: int = width
         self.height: int = height
         self.title: str = title
@@ -28,6 +51,7 @@ class MazeApp:
         self.output_file: str = config["OUTPUT_FILE"]
         self.perfect: bool = config["PERFECT"]
         self.seed: int | None = config.get("SEED")
+        self.config: Dict[str, Any] = config
 
         self.mlx: Mlx = Mlx()
         self.ptr: Any = self.mlx.mlx_init()
@@ -78,31 +102,88 @@ class MazeApp:
         ]
         self.current_palette: int = random.randrange(len(self.palettes))
 
+        # Drawing writes roles here; present() maps them to BGRA bytes.
+        self.roles: bytearray = bytearray(self.width * self.height)
+        self._luts: List[bytes] = []
+        self._dirty: Optional[Tuple[int, int]] = None
+        self._build_luts()
+
         self.show_path: bool = False
         self.path_coords: List[Tuple[int, int]] = []
 
-        self.generator: MazeGenerator = MazeGenerator(
-            self.maze_cols,
-            self.maze_rows,
-            self.entry,
-            self.exit,
-            self.output_file,
-            self.perfect,
-            seed=self.seed,
-        )
-        self._generate_and_save()
-
-    def _generate_and_save(self) -> None:
-        """Generate the maze, compute the path coordinates, and save output."""
-        self.generator.generate()
+        self.profiler: ActionProfiler = ActionProfiler(profile_dir)
+        self.show_stats: bool = False
+        self._generate_ms: float = 0.0
+        self._drawn_px: int = 0
+        self._presented_px: int = 0
+        self.frame_pixels: Tuple[int, int] = (0, 0)
+
+        self.generator: MazeGenerator = build_generator(config)
+        self.runner: Optional[StepRunner] = None
+        self.error: Optional[Exception] = None
+        # The action whose profile the running generation belongs to.
+        self._generation_action: str = "generate"
+        self.profiler.begin("generate")
+        with self.profiler.collect("generate"):
+            self._start_generation()
+        for warning in self.generator.mask_warnings:
+            print(warning)
+
+    def _start_generation(self) -> None:
+        """Start a step-wise generation that render_frame advances.
+
+        The first step builds the mask and validates the endpoints, so
+        configuration errors are still raised here.
+        """
+        if self.runner is not None:
+            self.runner.close()
+        self.path_coords = []
+        started: float = time.perf_counter()
+        self.runner = self.generator.start_generation()
+        self.runner.advance(max_steps=1)
+        self._generate_ms = (time.perf_counter() - started) * 1000
+
+    def _advance_generation(self) -> None:
+        """Run one frame budget of generation and redraw what changed."""
+        if self.runner is None:
+            return
+        action = self._generation_action
+        with self.profiler.collect(action):
+            started: float = time.perf_counter()
+            try:
+                done = self.runner.advance(budget_ms=self.FRAME_BUDGET_MS)
+            except (ValueError, RuntimeError) as exc:
+                self.error = exc
+                self.runner = None
+                self.mlx.mlx_loop_exit(self.ptr)
+                return
+            self._generate_ms += (time.perf_counter() - started) * 1000
+
+            changed = self.runner.take_changes()
+            if done:
+                self.runner = None
+                self.profiler.record("generate", self._generate_ms)
+                self._save_output()
+                self.draw_all()
+            elif changed is None:
+                self.draw_all()
+            else:
+                self.redraw_cells(changed)
+        if done:
+            self.profiler.end(action)
+
+    def _save_output(self) -> None:
+        """Compute the path coordinates and save the output file."""
+        with self.profiler.timed("solve"):
+            solution: str | None = self.generator.get_solution()
 
         try:
-            with open(self.output_file, "w", encoding="utf-8") as file:
-                file.write(self.generator.build_output_text())
+            with self.profiler.timed("write"):
+                with open(self.output_file, "wb") as file:
+                    self.generator.write_output(file)
         except OSError as exc:
             print(f"Warning: Could not save output file: {exc}")
 
-        solution: str | None = self.generator.get_solution()
         self.path_coords = [self.entry]
 
         if solution:
@@ -118,14 +199,70 @@ class MazeApp:
                     cx -= 1
                 self.path_coords.append((cx, cy))
 
-    def put_pixel(self, x: int, y: int, color: int) -> None:
-        """Write one pixel in the image buffer."""
+    def _build_luts(self) -> None:
+        """Build the role-to-byte table of each BGRA channel."""
+        theme: Dict[str, int] = self.palettes[self.current_palette]
+        colors: List[int] = [
+            theme["bg"],
+            theme["border"],
+            theme["path"],
+            self.ENTRY_COLOR,
+            self.EXIT_COLOR,
+            theme["ui"],
+        ]
+        padding: bytes = bytes(256 - len(colors))
+        self._luts = [
+            bytes((color >> shift) & 0xFF for color in colors) + padding
+            for shift in (0, 8, 16)
+        ]
+        self._luts.append(b"\xff" * 256)
+
+    def _mark_dirty(self, y_start: int, y_end: int) -> None:
+        """Extend the band of rows present() has to convert."""
+        if self._dirty is not None:
+            y_start = min(y_start, self._dirty[0])
+            y_end = max(y_end, self._dirty[1])
+        self._dirty = (y_start, y_end)
+
+    def present(self) -> None:
+        """Convert the dirty rows of the role buffer into the image.
+
+        Each channel is one ``bytes.translate`` through the palette table
+        and one strided slice write, per band of contiguous rows.
+        """
+        if self._dirty is None:
+            return
+        y_start, y_end = self._dirty
+        self._dirty = None
+        self._presented_px += (y_end - y_start) * self.width
+
+        with self.profiler.timed("present"):
+            self._convert_rows(y_start, y_end)
+
+    def _convert_rows(self, y_start: int, y_end: int) -> None:
+        """Write rows of the role buffer into the image, channel by channel."""
+        row_bytes: int = self.width * self.bytes_per_pixel
+        bands: List[Tuple[int, int]] = (
+            [(y_start, y_end)]
+            if self.size_line == row_bytes
+            else [(y, y + 1) for y in range(y_start, y_end)]
+        )
+        for band_start, band_end in bands:
+            roles: bytearray = self.roles[
+                band_start * self.width:band_end * self.width
+            ]
+            offset: int = band_start * self.size_line
+            end: int = offset + (band_end - band_start) * row_bytes
+            for channel, lut in enumerate(self._luts):
+                self.data[offset + channel:end:self.bytes_per_pixel] = (
+                    roles.translate(lut)
+                )
+
+    def put_pixel(self, x: int, y: int, role: int) -> None:
+        """Write one pixel role in the index buffer."""
         if 0 <= x < self.width and 0 <= y < self.height:
-            offset: int = (y * self.size_line) + (x * self.bytes_per_pixel)
-            self.data[offset] = color & 0xFF
-            self.data[offset + 1] = (color >> 8) & 0xFF
-            self.data[offset + 2] = (color >> 16) & 0xFF
-            self.data[offset + 3] = 255
+            self.roles[(y * self.width) + x] = role
+            self._mark_dirty(y, y + 1)
 
     def fill_area(
         self,
@@ -133,63 +270,107 @@ class MazeApp:
         start_y: int,
         rect_width: int,
         rect_height: int,
-        color: int,
+        role: int,
     ) -> None:
-        """Draw a filled rectangle."""
-        for y in range(start_y, start_y + rect_height):
-            for x in range(start_x, start_x + rect_width):
-                self.put_pixel(x, y, color)
+        """Draw a filled rectangle, one row slice at a time."""
+        x_start: int = max(0, start_x)
+        x_end: int = min(self.width, start_x + rect_width)
+        y_start: int = max(0, start_y)
+        y_end: int = min(self.height, start_y + rect_height)
+        if x_start >= x_end or y_start >= y_end:
+            return
 
-    def draw_maze(self, wall_color: int) -> None:
-        """Render the maze walls."""
+        self._drawn_px += (x_end - x_start) * (y_end - y_start)
+        run: bytes = bytes([role]) * (x_end - x_start)
+        for y in range(y_start, y_end):
+            base: int = y * self.width
+            self.roles[base + x_start:base + x_end] = run
+        self._mark_dirty(y_start, y_end)
+
+    def _cell_layout(self) -> Tuple[int, int, int, int]:
+        """Return the maze origin and the size of one cell in pixels."""
         margin_w: int = int(self.width * 0.10)
         margin_s: int = int(self.height * 0.20)
         margin_n: int = int(self.height * 0.05)
 
-        maze_x: int = margin_w
-        maze_y: int = margin_n
         maze_w: int = self.width - (margin_w * 2)
         maze_h: int = self.height - margin_n - margin_s
 
         cell_w: int = maze_w // self.maze_cols
         cell_h: int = maze_h // self.maze_rows
+        return margin_w, margin_n, cell_w, cell_h
+
+    def draw_cell(
+        self,
+        x: int,
+        y: int,
+        cell_val: int,
+        is_blocked: bool,
+        wall_role: int,
+    ) -> None:
+        """Render the walls of one cell."""
+        maze_x, maze_y, cell_w, cell_h = self._cell_layout()
         thickness: int = 2
+        px: int = maze_x + (x * cell_w)
+        py: int = maze_y + (y * cell_h)
 
+        if is_blocked:
+            self.fill_area(px, py, cell_w, cell_h, wall_role)
+            return
+        if cell_val & 1:
+            self.fill_area(px, py, cell_w, thickness, wall_role)
+        if cell_val & 2:
+            self.fill_area(
+                px + cell_w - thickness,
+                py,
+                thickness,
+                cell_h,
+                wall_role,
+            )
+        if cell_val & 4:
+            self.fill_area(
+                px,
+                py + cell_h - thickness,
+                cell_w,
+                thickness,
+                wall_role,
+            )
+        if cell_val & 8:
+            self.fill_area(px, py, thickness, cell_h, wall_role)
+
+    def draw_maze(self, wall_role: int) -> None:
+        """Render the maze walls."""
         grid: List[List[int]] = self.generator.get_grid()
         blocked_mask: List[List[bool]] = self.generator.get_blocked_mask()
 
         for y in range(self.maze_rows):
             for x in range(self.maze_cols):
-                cell_val: int = grid[y][x]
-                is_blocked: bool = blocked_mask[y][x]
-                px: int = maze_x + (x * cell_w)
-                py: int = maze_y + (y * cell_h)
-
-                if is_blocked:
-                    self.fill_area(px, py, cell_w, cell_h, wall_color)
-                else:
-                    if cell_val & 1:
-                        self.fill_area(px, py, cell_w, thickness, wall_color)
-                    if cell_val & 2:
-                        self.fill_area(
-                            px + cell_w - thickness,
-                            py,
-                            thickness,
-                            cell_h,
-                            wall_color,
-                        )
-                    if cell_val & 4:
-                        self.fill_area(
-                            px,
-                            py + cell_h - thickness,
-                            cell_w,
-                            thickness,
-                            wall_color,
-                        )
-                    if cell_val & 8:
-                        self.fill_area(px, py, thickness, cell_h, wall_color)
-
-    def draw_path(self, color: int) -> None:
+                self.draw_cell(
+                    x, y, grid[y][x], blocked_mask[y][x], wall_role
+                )
+
+    def redraw_cells(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """Clear and redraw only the given cells, then the endpoints."""
+        maze_x, maze_y, cell_w, cell_h = self._cell_layout()
+        grid = self.generator.grid.cells
+        blocked = self.generator.blocked
+
+        with self.profiler.timed("draw"):
+            for x, y in cells:
+                self.fill_area(
+                    maze_x + (x * cell_w),
+                    maze_y + (y * cell_h),
+                    cell_w,
+                    cell_h,
+                    self.ROLE_BG,
+                )
+                self.draw_cell(
+                    x, y, grid[y][x], blocked[y][x], self.ROLE_BORDER
+                )
+
+            self.draw_endpoints()
+
+    def draw_path(self, role: int) -> None:
         """Draw the shortest path on top of the maze."""
         if not self.path_coords:
             return
@@ -209,7 +390,7 @@ class MazeApp:
             py: int = margin_n + (y * cell_h) + (cell_h // 4)
             pw: int = cell_w // 2
             ph: int = cell_h // 2
-            self.fill_area(px, py, pw, ph, color)
+            self.fill_area(px, py, pw, ph, role)
 
     def draw_endpoints(self) -> None:
         """Draw the entry and exit markers."""
@@ -226,18 +407,35 @@ class MazeApp:
         ex, ey = self.entry
         px_entry: int = margin_w + (ex * cell_w) + (cell_w // 4)
         py_entry: int = margin_n + (ey * cell_h) + (cell_h // 4)
-        self.fill_area(px_entry, py_entry, cell_w // 2, cell_h // 2, 0x00FF00)
+        self.fill_area(
+            px_entry, py_entry, cell_w // 2, cell_h // 2, self.ROLE_ENTRY
+        )
 
         xx, xy = self.exit
         px_exit: int = margin_w + (xx * cell_w) + (cell_w // 4)
         py_exit: int = margin_n + (xy * cell_h) + (cell_h // 4)
-        self.fill_area(px_exit, py_exit, cell_w // 2, cell_h // 2, 0xFF0000)
+        self.fill_area(
+            px_exit, py_exit, cell_w // 2, cell_h // 2, self.ROLE_EXIT
+        )
 
     def draw_ui_text(self) -> None:
-        """Render the bottom menu."""
+        """Render the bottom menu, and the timing overlay if enabled."""
         theme: Dict[str, int] = self.palettes[self.current_palette]
+        if self.show_stats:
+            for index, line in enumerate(self.stats_lines()):
+                self.mlx.mlx_string_put(
+                    self.ptr,
+                    self.win,
+                    int(self.width * 0.10),
+                    int(self.height * 0.82) + (index * 20),
+                    theme["text"],
+                    line,
+                )
+
         y_text: int = int(self.height * 0.92)
-        menu_items: List[str] = ["1: REGEN", "2: PATH", "3: COLOR", "4: QUIT"]
+        menu_items: List[str] = [
+            "1: REGEN", "2: PATH", "3: COLOR", "4: QUIT", "5: STATS",
+        ]
         spacing: int = self.width // (len(menu_items) + 1)
 
         for index, item in enumerate(menu_items):
@@ -251,47 +449,81 @@ class MazeApp:
                 item,
             )
 
+    def stats_lines(self) -> List[str]:
+        """Return the overlay text: last stage times and frame pixels."""
+        def ms(stage: str) -> str:
+            value: Optional[float] = self.profiler.last(stage)
+            return "-" if value is None else f"{value:.1f}"
+
+        draw_mean: Optional[float] = self.profiler.mean("draw")
+        drawn, presented = self.frame_pixels
+        return [
+            f"gen {ms('generate')} ms  solve {ms('solve')} ms  "
+            f"write {ms('write')} ms",
+            f"draw {ms('draw')} ms (avg "
+            f"{'-' if draw_mean is None else f'{draw_mean:.1f}'})  "
+            f"present {ms('present')} ms",
+            f"pixels/frame: {drawn} drawn, {presented} presented",
+        ]
+
     def change_color_scheme(self) -> None:
-        """Change the active palette and redraw the maze."""
+        """Change the active palette without redrawing any geometry.
+
+        Only the lookup tables change; present() re-maps every pixel.
+        """
         self.current_palette = random.randint(0, len(self.palettes) - 1)
-        self.draw_all()
+        self._build_luts()
+        self._mark_dirty(0, self.height)
 
     def draw_all(self) -> None:
         """Draw the full scene."""
-        theme: Dict[str, int] = self.palettes[self.current_palette]
-        self.fill_area(0, 0, self.width, self.height, theme["bg"])
-        self.draw_maze(theme["border"])
+        with self.profiler.timed("draw"):
+            self.fill_area(0, 0, self.width, self.height, self.ROLE_BG)
+            self.draw_maze(self.ROLE_BORDER)
 
-        if self.show_path:
-            self.draw_path(theme["path"])
+            if self.show_path:
+                self.draw_path(self.ROLE_PATH)
 
-        self.draw_endpoints()
+            self.draw_endpoints()
 
     def handle_key(self, keycode: int, _params: Any) -> int:
         """Handle user keyboard interactions."""
         if keycode in [65307, 113, 52]:
             self.mlx.mlx_loop_exit(self.ptr)
         elif keycode == 49:
-            self.generator = MazeGenerator(
-                self.maze_cols,
-                self.maze_rows,
-                self.entry,
-                self.exit,
-                self.output_file,
-                self.perfect,
-                seed=self.seed,
-            )
-            self._generate_and_save()
-            self.draw_all()
+            # A generation still running is abandoned: close its profile.
+            self.profiler.end(self._generation_action)
+            self._generation_action = "regen"
+            self.profiler.begin("regen")
+            with self.profiler.collect("regen"):
+                self.generator.reseed(self.seed)
+                self._start_generation()
+                self.draw_all()
         elif keycode == 50:
-            self.show_path = not self.show_path
-            self.draw_all()
+            self.profiler.begin("path")
+            with self.profiler.collect("path"):
+                self.show_path = not self.show_path
+                self.draw_all()
+                self.present()
+            self.profiler.end("path")
         elif keycode == 51:
-            self.change_color_scheme()
+            self.profiler.begin("color")
+            with self.profiler.collect("color"):
+                self.change_color_scheme()
+                self.present()
+            self.profiler.end("color")
+        elif keycode == 53:
+            self.show_stats = not self.show_stats
         return 0
 
     def render_frame(self, _params: Any) -> int:
-        """Push the image buffer to the window."""
+        """Advance generation, then push the image buffer to the window."""
+        if self.runner is not None:
+            self._advance_generation()
+        self.present()
+        if self._drawn_px or self._presented_px:
+            self.frame_pixels = (self._drawn_px, self._presented_px)
+            self._drawn_px = self._presented_px = 0
         self.mlx.mlx_put_image_to_window(self.ptr, self.win, self.img, 0, 0)
         self.draw_ui_text()
         return 0
@@ -302,3 +534,6 @@ class MazeApp:
         self.mlx.mlx_key_hook(self.win, self.handle_key, None)
         self.mlx.mlx_loop_hook(self.ptr, self.render_frame, None)
         self.mlx.mlx_loop(self.ptr)
+        self.profiler.end_all()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,76 @@
+"""Batched generation: per-maze reproducibility and valid solutions."""
+
+from __future__ import annotations
+
+import pytest
+
+from MazeGen import MazeSolver
+
+np = pytest.importorskip("numpy")
+
+from MazeGen.batch import generate_batch  # noqa: E402
+
+ALGORITHMS = ["sidewinder", "binary_tree"]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_maze_depends_only_on_seed_and_index(algorithm: str) -> None:
+    """Maze (seed, index) is the same whichever batch builds it."""
+    whole = generate_batch(30, 20, (0, 0), (29, 19), 40, seed=7,
+                           algorithm=algorithm)
+    single = generate_batch(30, 20, (0, 0), (29, 19), 1, seed=7,
+                            start=13, algorithm=algorithm)
+    middle = generate_batch(30, 20, (0, 0), (29, 19), 20, seed=7,
+                            start=10, algorithm=algorithm)
+
+    assert single.index(0) == 13
+    assert np.array_equal(single.walls[0], whole.walls[13])
+    assert single.solutions[0] == whole.solutions[13]
+    assert np.array_equal(middle.walls, whole.walls[10:30])
+    assert middle.solutions == whole.solutions[10:30]
+    assert single.build_output_text(0) == whole.build_output_text(13)
+
+    other = generate_batch(30, 20, (0, 0), (29, 19), 1, seed=8,
+                           start=13, algorithm=algorithm)
+    assert not np.array_equal(other.walls[0], whole.walls[13])
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_batch_mazes_are_perfect_and_solved(algorithm: str) -> None:
+    """Each maze is a spanning tree solved by its unique path."""
+    batch = generate_batch(30, 20, (0, 0), (29, 19), 70, seed=1,
+                           algorithm=algorithm)
+    blocked = batch.blocked
+    free = int((~blocked).sum())
+    for k in range(len(batch)):
+        walls = batch.walls[k]
+        assert (walls[blocked] == 15).all()
+        opened = int(((walls & 2) == 0).sum() + ((walls & 4) == 0).sum())
+        assert opened == free - 1
+
+        expected = MazeSolver(
+            batch.grid(k).cells, (0, 0), (29, 19), blocked.tolist()
+        ).solve()
+        assert expected is not None
+        assert batch.solutions[k] == expected
+
+
+def test_output_text_matches_the_grid() -> None:
+    """The text output lists the hex rows, entry, exit and path."""
+    batch = generate_batch(12, 9, (0, 0), (11, 8), 2, seed=3)
+    grid = batch.grid(1)
+    lines = batch.build_output_text(1).split("\n")
+    assert lines[:9] == [
+        "".join(format(value, "x") for value in row) for row in grid.cells
+    ]
+    assert lines[9:] == ["", "0,0", "11,8", batch.solutions[1], ""]
+
+
+def test_rejects_invalid_requests() -> None:
+    """Bad counts, starts and algorithms raise ValueError."""
+    with pytest.raises(ValueError):
+        generate_batch(10, 10, (0, 0), (9, 9), 0, seed=1)
+    with pytest.raises(ValueError):
+        generate_batch(10, 10, (0, 0), (9, 9), 1, seed=1, start=-1)
+    with pytest.raises(ValueError):
+        generate_batch(10, 10, (0, 0), (9, 9), 1, seed=1, algorithm="dfs")
@@ -0,0 +1,98 @@
+"""Braiding: removing dead ends without opening 3x3 areas."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from MazeGen import MazeGenerator
+from MazeGen.imperfect import DEAD_END_VALUES, LoopAdder
+
+EAST, SOUTH = 2, 4
+
+
+def _dead_ends(maze: MazeGenerator) -> int:
+    """Return the number of free cells with exactly one opening."""
+    return sum(
+        1
+        for y, row in enumerate(maze.grid.cells)
+        for x, value in enumerate(row)
+        if value in DEAD_END_VALUES and not maze.blocked[y][x]
+    )
+
+
+def _has_open_3x3(maze: MazeGenerator) -> bool:
+    """Return True if some 3x3 square has no inner wall."""
+    cells = maze.grid.cells
+    for top in range(maze.height - 2):
+        for left in range(maze.width - 2):
+            if all(
+                not cells[y][x] & EAST
+                for y in range(top, top + 3)
+                for x in range(left, left + 2)
+            ) and all(
+                not cells[y][x] & SOUTH
+                for y in range(top, top + 2)
+                for x in range(left, left + 3)
+            ):
+                return True
+    return False
+
+
+def _perfect(seed: int) -> MazeGenerator:
+    """Return a generated 40x30 perfect maze."""
+    maze = MazeGenerator(40, 30, (0, 0), (39, 29), "<test>", True, seed=seed)
+    maze.generate()
+    return maze
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("fraction", [0.0, 0.25, 0.5, 1.0])
+def test_braid_removes_the_requested_fraction(
+    seed: int,
+    fraction: float,
+) -> None:
+    """The dead-end count drops by exactly the number reported."""
+    maze = _perfect(seed)
+    before = _dead_ends(maze)
+    removed = LoopAdder(random.Random(seed)).braid(
+        maze.grid, maze.blocked, fraction
+    )
+    target = round(fraction * before)
+
+    assert target <= removed <= target + 1
+    assert _dead_ends(maze) == before - removed
+    if fraction == 1.0:
+        assert _dead_ends(maze) == 0
+    assert not _has_open_3x3(maze)
+
+
+@pytest.mark.parametrize("algorithm", ["dfs", "sidewinder"])
+def test_braided_maze_stays_valid(algorithm: str) -> None:
+    """A braided maze keeps its mask closed and every cell reachable."""
+    maze = MazeGenerator(
+        40, 30, (0, 0), (39, 29), "<test>", False,
+        seed=9, algorithm=algorithm, braid=1.0,
+    )
+    maze.generate()
+
+    assert _dead_ends(maze) == 0
+    assert not _has_open_3x3(maze)
+    for y in range(maze.height):
+        for x in range(maze.width):
+            if maze.blocked[y][x]:
+                assert maze.grid.cells[y][x] == 15
+    assert maze._check_connectivity()
+    assert maze.solve() is not None
+
+
+@pytest.mark.parametrize(
+    "perfect, braid", [(True, 0.5), (False, -0.1), (False, 1.5)]
+)
+def test_rejects_invalid_braid(perfect: bool, braid: float) -> None:
+    """Braiding needs an imperfect maze and a fraction in [0, 1]."""
+    with pytest.raises(ValueError):
+        MazeGenerator(
+            40, 30, (0, 0), (39, 29), "<test>", perfect, braid=braid
+        )
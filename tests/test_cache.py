@@ -0,0 +1,85 @@
+"""MazeCache hits, misses, keys and least-recently-used eviction."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from MazeGen import MazeCache, MazeGenerator
+from MazeGen import carver_vectorized
+from MazeGen.cache import CachedMaze
+
+
+class _RecordingCache(MazeCache):
+    """MazeCache remembering whether each load was a hit."""
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 20) -> None:
+        """Open the cache with an empty hit log."""
+        super().__init__(directory, max_bytes)
+        self.hits: List[bool] = []
+
+    def load(self, key: str) -> Optional[CachedMaze]:
+        """Load as usual and log whether it was a hit."""
+        cached = super().load(key)
+        self.hits.append(cached is not None)
+        return cached
+
+
+def _maze(cache: MazeCache, seed: int, algorithm: str) -> MazeGenerator:
+    """Return a generated 21x15 imperfect maze."""
+    maze = MazeGenerator(
+        21, 15, (0, 0), (20, 14), "<test>", False,
+        seed=seed, algorithm=algorithm, cache=cache,
+    )
+    maze.generate()
+    return maze
+
+
+@pytest.mark.parametrize("algorithm", ["dfs", "sidewinder"])
+def test_miss_then_hit(tmp_path: Path, algorithm: str) -> None:
+    """The second identical request is served from the cache."""
+    cache = _RecordingCache(str(tmp_path))
+    first = _maze(cache, 3, algorithm)
+    second = _maze(cache, 3, algorithm)
+    _maze(cache, 4, algorithm)
+
+    assert cache.hits == [False, True, False]
+    assert second.to_hex_string() == first.to_hex_string()
+    assert second.get_blocked_mask() == first.get_blocked_mask()
+    assert second.solve() == first.solve()
+
+
+def test_key_tracks_the_field_carver_backend(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """NumPy and pure-Python field carvers never share an entry."""
+    maze = MazeGenerator(
+        21, 15, (0, 0), (20, 14), "<test>", True,
+        seed=1, algorithm="sidewinder", cache=MazeCache(str(tmp_path)),
+    )
+    numpy_key = maze._cache_key(1)
+    monkeypatch.setattr(carver_vectorized, "HAS_NUMPY", False)
+    assert maze._cache_key(1) != numpy_key
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Over the cap, the entries used longest ago are deleted first."""
+    entry = CachedMaze(10, 10, bytes(100), bytes(20), "E" * 9)
+    cache = MazeCache(str(tmp_path), max_bytes=10_000)
+    for name in ("a", "b", "c"):
+        cache.store(name, entry)
+    size = os.path.getsize(cache._path("a"))
+    for age, name in enumerate(("a", "b", "c")):
+        os.utime(cache._path(name), (1000 + age, 1000 + age))
+
+    assert cache.load("a") is not None
+    cache.max_bytes = 3 * size
+    cache.store("d", entry)
+
+    assert cache.load("b") is None
+    for name in ("a", "c", "d"):
+        assert cache.load(name) == entry
@@ -0,0 +1,86 @@
+"""Killing a checkpointed DFS carve and resuming it."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from MazeGen import MazeGenerator
+
+ROOT = Path(__file__).resolve().parents[1]
+
+KILLED_RUN = """
+import itertools, os, sys
+from MazeGen import MazeGenerator
+maze = MazeGenerator(
+    61, 41, (0, 0), (60, 40), "<test>", False, seed=5,
+    backend=sys.argv[1], storage_dir=sys.argv[2] or None,
+    checkpoint_path=sys.argv[3], checkpoint_every=100,
+)
+for _ in itertools.islice(maze.iter_generate(), 1234):
+    pass
+os._exit(1)
+"""
+
+
+def _maze(backend: str, storage: Path, checkpoint: str) -> MazeGenerator:
+    """Return the generator the killed run and its resume both use."""
+    return MazeGenerator(
+        61, 41, (0, 0), (60, 40), "<test>", False, seed=5,
+        backend=backend,
+        storage_dir=str(storage) if backend == "mmap" else None,
+        checkpoint_path=checkpoint or None,
+        checkpoint_every=100,
+    )
+
+
+@pytest.mark.parametrize("backend", ["memory", "mmap"])
+def test_resume_after_kill_matches_uninterrupted_run(
+    tmp_path: Path,
+    backend: str,
+) -> None:
+    """A run killed mid-carve resumes into the uninterrupted maze."""
+    checkpoint = str(tmp_path / "maze.ckpt")
+    storage = tmp_path / "storage"
+    killed = subprocess.run(
+        [
+            sys.executable, "-c", KILLED_RUN, backend,
+            str(storage) if backend == "mmap" else "", checkpoint,
+        ],
+        cwd=ROOT,
+        env=dict(os.environ, PYTHONPATH=str(ROOT)),
+    )
+    assert killed.returncode == 1
+    assert os.path.exists(checkpoint)
+
+    reference = _maze(backend, tmp_path / "reference", "")
+    reference_steps = sum(1 for _ in reference.iter_generate())
+    resumed = _maze(backend, storage, checkpoint)
+    resumed_steps = sum(1 for _ in resumed.iter_generate())
+
+    assert resumed_steps <= reference_steps - 1200
+    assert resumed.to_hex_string() == reference.to_hex_string()
+    assert resumed.solve() == reference.solve()
+    assert not os.path.exists(checkpoint)
+    reference.close()
+    resumed.close()
+
+
+def test_rejects_checkpoint_of_other_settings(tmp_path: Path) -> None:
+    """A checkpoint never resumes a carve with different settings."""
+    checkpoint = str(tmp_path / "maze.ckpt")
+    maze = _maze("memory", tmp_path, checkpoint)
+    for _ in zip(range(500), maze.iter_generate()):
+        pass
+    assert os.path.exists(checkpoint)
+
+    other = MazeGenerator(
+        61, 41, (0, 0), (60, 40), "<test>", False, seed=6,
+        checkpoint_path=checkpoint, checkpoint_every=100,
+    )
+    with pytest.raises(ValueError):
+        other.generate()
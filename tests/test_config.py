@@ -0,0 +1,67 @@
+"""Configuration parsing reports problems as ValueError."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from MazeGen.config import parse_config
+
+VALID = """\
+# comment
+WIDTH=20
+HEIGHT=15
+ENTRY=0,0
+EXIT=19,14
+OUTPUT_FILE=maze.txt
+PERFECT=True
+"""
+
+
+def _write(tmp_path: Path, text: str) -> str:
+    """Write a configuration file and return its path."""
+    path = tmp_path / "config.txt"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_parses_a_valid_file(tmp_path: Path) -> None:
+    """Values are converted to their types."""
+    config = parse_config(_write(tmp_path, VALID + "SEED=4\nBRAID=0.5\n"))
+    assert config["WIDTH"] == 20
+    assert config["ENTRY"] == (0, 0)
+    assert config["PERFECT"] is True
+    assert config["SEED"] == 4
+    assert config["BRAID"] == 0.5
+
+
+@pytest.mark.parametrize(
+    "extra, message",
+    [
+        ("WIDTH=3\n", "Duplicate"),
+        ("COLOUR=red\n", "Unknown"),
+        ("SEED=x\n", "SEED"),
+        ("BRAID=2\n", "BRAID"),
+        ("TIMEOUT=0\n", "TIMEOUT"),
+        ("no equals sign\n", "missing '='"),
+    ],
+)
+def test_rejects_invalid_files(
+    tmp_path: Path,
+    extra: str,
+    message: str,
+) -> None:
+    """Invalid entries raise ValueError instead of exiting."""
+    with pytest.raises(ValueError, match=message):
+        parse_config(_write(tmp_path, VALID + extra))
+
+
+def test_rejects_missing_keys_and_files(tmp_path: Path) -> None:
+    """Missing mandatory keys and missing files raise ValueError."""
+    with pytest.raises(ValueError, match="OUTPUT_FILE"):
+        parse_config(_write(tmp_path, VALID.replace("OUTPUT_FILE", "#")))
+    with pytest.raises(ValueError, match="not found"):
+        parse_config(str(tmp_path / "missing.txt"))
+    with pytest.raises(ValueError, match="Could not read"):
+        parse_config(str(tmp_path))
@@ -0,0 +1,88 @@
+"""IncrementalSolver against a full BFS on random wall edits."""
+
+from __future__ import annotations
+
+import random
+from typing import List, Tuple
+
+import pytest
+
+from MazeGen import IncrementalSolver, MazeGenerator, MazeSolver
+
+Edit = Tuple[int, int, str, bool]
+
+
+def _random_edits(
+    maze: MazeGenerator,
+    rng: random.Random,
+    count: int,
+) -> List[Edit]:
+    """Return random open/close edits of walls between two free cells."""
+    offsets = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+    edits: List[Edit] = []
+    while len(edits) < count:
+        x = rng.randrange(maze.width)
+        y = rng.randrange(maze.height)
+        direction = rng.choice("NESW")
+        dx, dy = offsets[direction]
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < maze.width and 0 <= ny < maze.height):
+            continue
+        if maze.blocked[y][x] or maze.blocked[ny][nx]:
+            continue
+        edits.append((x, y, direction, rng.random() < 0.5))
+    return edits
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("perfect", [True, False])
+def test_matches_full_bfs(seed: int, perfect: bool) -> None:
+    """Every edit leaves the same field and path length as a rebuild."""
+    maze = MazeGenerator(
+        17, 13, (0, 0), (16, 12), "<test>", perfect, seed=seed
+    )
+    maze.generate()
+    solver = IncrementalSolver(maze.grid, maze.entry, maze.exit, maze.blocked)
+    reference = IncrementalSolver(
+        maze.grid, maze.entry, maze.exit, maze.blocked
+    )
+
+    for x, y, direction, opened in _random_edits(
+        maze, random.Random(seed), 150
+    ):
+        if opened:
+            path = solver.open_wall(x, y, direction)
+        else:
+            path = solver.close_wall(x, y, direction)
+
+        reference.rebuild()
+        assert solver.dist == reference.dist
+
+        expected = MazeSolver(
+            maze.grid.cells, maze.entry, maze.exit, maze.blocked
+        ).solve()
+        if expected is None:
+            assert path is None
+        else:
+            assert path is not None
+            assert len(path) == len(expected)
+
+
+def test_blocked_cell_walls_are_not_edited() -> None:
+    """Editing a wall of a blocked cell raises and leaves the grid as is."""
+    maze = MazeGenerator(20, 15, (0, 0), (19, 14), "<test>", True, seed=1)
+    maze.generate()
+    solver = IncrementalSolver(maze.grid, maze.entry, maze.exit, maze.blocked)
+
+    x, y = next(
+        (x, y)
+        for y in range(maze.height)
+        for x in range(maze.width - 1)
+        if not maze.blocked[y][x] and maze.blocked[y][x + 1]
+    )
+    before = maze.to_hex_string()
+    with pytest.raises(ValueError):
+        solver.open_wall(x, y, "E")
+    with pytest.raises(ValueError):
+        solver.close_wall(x + 1, y, "W")
+    assert maze.to_hex_string() == before
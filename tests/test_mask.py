@@ -0,0 +1,115 @@
+"""Mask layouts: caching, packing and connectivity of the free cells."""
+
+from __future__ import annotations
+
+import random
+from collections import deque
+from typing import Tuple
+
+import pytest
+
+from MazeGen import MaskBuilder, MaskPattern, MazeGenerator
+from MazeGen.mask import PATTERN_42
+from MazeGen.storage import PackedBitmap
+
+HEART = MaskPattern.from_text(
+    ".#.#.\n#####\n.###.\n..#..", name="heart"
+)
+
+
+def _bfs_connected(rows: Tuple[bytes, ...]) -> bool:
+    """Return True if the free cells form one region, by plain BFS."""
+    free = {
+        (x, y)
+        for y, row in enumerate(rows)
+        for x, value in enumerate(row)
+        if not value
+    }
+    if not free:
+        return True
+    start = next(iter(free))
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if nxt in free and nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return len(seen) == len(free)
+
+
+def test_layout_is_cached_and_shares_rows() -> None:
+    """Equal requests share one layout whose repeated rows are shared."""
+    first = MaskBuilder(HEART, 1, None).layout(300, 200)
+    assert MaskBuilder(HEART, 1, None).layout(300, 200) is first
+    assert MaskBuilder(HEART, 2, None).layout(300, 200) is not first
+    assert first.scale > 1
+    assert len({id(row) for row in first.rows}) <= HEART.height + 1
+
+
+@pytest.mark.parametrize("size", [(9, 7), (40, 30), (301, 123)])
+def test_packed_mask_matches_rows(size: Tuple[int, int]) -> None:
+    """build_into writes the same mask into lists and PackedBitmaps."""
+    width, height = size
+    builder = MaskBuilder(PATTERN_42, 1, None)
+    layout = builder.layout(width, height)
+
+    flags = [[True] * width for _ in range(height)]
+    bitmap = PackedBitmap(width, height)
+    builder.build_into(flags, width, height)
+    builder.build_into(bitmap, width, height)
+
+    expected = [[bool(v) for v in row] for row in layout.rows]
+    assert flags == expected
+    assert [list(row) for row in bitmap] == expected
+    assert bytes(bitmap.buffer) == layout.packed
+    assert layout.blocked_cells == sum(map(sum, expected))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_connectivity_matches_bfs(seed: int) -> None:
+    """Run-based connectivity agrees with a BFS over the cells."""
+    rng = random.Random(seed)
+    width, height = rng.randint(2, 6), rng.randint(2, 6)
+    text = "\n".join(
+        "".join(rng.choice("#.") for _ in range(width))
+        for _ in range(height)
+    )
+    pattern = MaskPattern.from_text(text, name=f"random-{seed}")
+    layout = MaskBuilder(pattern, rng.randint(0, 2), None).layout(
+        rng.randint(6, 30), rng.randint(6, 30)
+    )
+    assert layout.connected == _bfs_connected(layout.rows)
+
+
+def test_splitting_mask_is_rejected() -> None:
+    """A mask enclosing free cells fails before anything is carved."""
+    ring = MaskPattern.from_text("###\n#.#\n###", name="ring")
+    maze = MazeGenerator(20, 20, (0, 0), (19, 19), "<test>", True, mask=ring)
+    with pytest.raises(ValueError, match="ring"):
+        maze.generate()
+
+
+@pytest.mark.parametrize("backend", ["memory", "mmap"])
+@pytest.mark.parametrize(
+    "algorithm", ["dfs", "dfs_lean", "sidewinder", "binary_tree"]
+)
+def test_masked_maze_stays_connected(backend: str, algorithm: str) -> None:
+    """Every algorithm closes the blocked cells and reaches all others."""
+    maze = MazeGenerator(
+        60, 40, (0, 0), (59, 39), "<test>", True, seed=3,
+        algorithm=algorithm, backend=backend, mask=HEART,
+        mask_max_scale=None,
+    )
+    maze.generate()
+    layout = MaskBuilder(HEART, 1, None).layout(60, 40)
+    cells = maze.grid.cells
+    for y in range(40):
+        for x in range(60):
+            assert bool(maze.blocked[y][x]) == layout.is_blocked(x, y)
+            if layout.is_blocked(x, y):
+                assert cells[y][x] == 15
+    assert maze._check_connectivity()
+    assert maze.solve() is not None
+    maze.close()
@@ -0,0 +1,87 @@
+"""MazeService request validation and coalescing of identical requests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Iterator, List, Tuple
+
+import pytest
+
+from MazeGen.service import MazeService
+
+Json = Any
+
+BASE: Json = {"width": 20, "height": 15, "entry": [0, 0], "exit": [19, 14]}
+
+
+@pytest.fixture(scope="module")
+def service() -> Iterator[MazeService]:
+    """Return one service with a single worker for the whole module."""
+    maze_service = MazeService(workers=1)
+    try:
+        yield maze_service
+    finally:
+        maze_service.close()
+
+
+def _post(service: MazeService, *bodies: Json) -> List[Tuple[int, Json]]:
+    """Send concurrent /generate requests and return (status, body)s."""
+
+    async def send() -> List[Tuple[int, Json]]:
+        return list(await asyncio.gather(*(
+            service.dispatch("POST", "/generate", json.dumps(body).encode())
+            for body in bodies
+        )))
+
+    return asyncio.run(send())
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"width": True},
+        {"height": False},
+        {"width": 2.5},
+        {"seed": True},
+        {"seed": "1"},
+        {"entry": [True, 0]},
+        {"exit": [19]},
+        {"perfect": 1},
+        {"algorithm": "nope"},
+        {"timeout": 0},
+        {"exit": [20, 14]},
+        {"width": 100_000, "height": 100_000},
+    ],
+)
+def test_rejects_invalid_requests(
+    service: MazeService,
+    override: Json,
+) -> None:
+    """Bad settings answer 400 without starting a job."""
+    computed = service.stats.computed
+    [(status, body)] = _post(service, dict(BASE, **override))
+    assert status == 400
+    assert body["error"]
+    assert service.stats.computed == computed
+
+
+def test_coalesces_identical_requests(service: MazeService) -> None:
+    """Concurrent twins share one job; a later twin hits the LRU."""
+    body = dict(BASE, seed=7)
+    stats = service.stats
+    computed, coalesced, hits = (
+        stats.computed, stats.coalesced, stats.lru_hits
+    )
+
+    first, second = _post(service, body, dict(body, timeout=30))
+    assert first[0] == second[0] == 200
+    assert first[1] == second[1]
+    assert stats.computed == computed + 1
+    assert stats.coalesced == coalesced + 1
+
+    [(status, again)] = _post(service, body)
+    assert status == 200
+    assert again == first[1]
+    assert stats.lru_hits == hits + 1
+    assert stats.computed == computed + 1
@@ -0,0 +1,78 @@
+"""Step-wise generation against one-shot generate()."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+from MazeGen import MazeGenerator
+from MazeGen.stepwise import StepRunner
+
+SETTINGS: List[Dict[str, Any]] = [
+    {"perfect": True},
+    {"perfect": False},
+    {"perfect": False, "braid": 0.5},
+    {"perfect": True, "algorithm": "dfs_lean"},
+    {"perfect": False, "algorithm": "sidewinder"},
+    {"perfect": True, "algorithm": "binary_tree"},
+    {"perfect": False, "tile_size": 8, "workers": 1},
+    {"perfect": False, "backend": "mmap"},
+]
+
+
+def _maze(seed: int, settings: Dict[str, Any]) -> MazeGenerator:
+    """Return a 25x19 generator with the given extra settings."""
+    return MazeGenerator(
+        25, 19, (0, 0), (24, 18), "<test>", seed=seed, **settings
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("settings", SETTINGS)
+def test_steps_build_the_one_shot_maze(
+    seed: int,
+    settings: Dict[str, Any],
+) -> None:
+    """Exhausting iter_generate() leaves exactly what generate() builds."""
+    one_shot = _maze(seed, settings)
+    one_shot.generate()
+    stepped = _maze(seed, settings)
+    for _changed in stepped.iter_generate():
+        pass
+
+    assert stepped.to_hex_string() == one_shot.to_hex_string()
+    assert stepped.solve() == one_shot.solve()
+    one_shot.close()
+    stepped.close()
+
+
+@pytest.mark.parametrize("settings", SETTINGS[:3])
+def test_reported_changes_cover_every_edit(settings: Dict[str, Any]) -> None:
+    """Redrawing only the reported cells keeps a copy of the grid exact."""
+    maze = _maze(4, settings)
+    runner = StepRunner(maze.iter_generate())
+    copy = [[0] * maze.width for _ in range(maze.height)]
+    done = False
+    while not done:
+        done = runner.advance(max_steps=7)
+        cells = maze.grid.cells
+        changed = runner.take_changes()
+        if changed is None:
+            copy = [list(row) for row in cells]
+        else:
+            for x, y in changed:
+                copy[y][x] = cells[y][x]
+        assert copy == [list(row) for row in cells]
+
+
+def test_reseeded_instance_matches_fresh_generators() -> None:
+    """One instance stepped through several seeds matches fresh ones."""
+    reused = _maze(0, {"perfect": False})
+    for seed in (5, 6, 5):
+        reused.reseed(seed)
+        for _changed in reused.iter_generate():
+            pass
+        fresh = _maze(seed, {"perfect": False})
+        fresh.generate()
+        assert reused.to_hex_string() == fresh.to_hex_string()